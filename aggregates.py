@@ -0,0 +1,144 @@
+# 년도별 집계 저장소 : 새로 들어온 월 데이터만 반영해 년도별 합계 / 개수 / 평균 / 증감률을 갱신
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from data_loader import load_waste_monthly, waste_monthly_file, CACHE_DIR, DEFAULT_DISTRICT
+from profiling import traced
+
+AGGREGATE_DIR = os.path.join(CACHE_DIR, "aggregates")
+
+PERIOD_COLUMN = '날짜'
+
+
+class AnnualAggregateStore:
+    """년도별 합계·개수와 마지막으로 반영한 월(watermark)을 보관한다."""
+
+    def __init__(self, sums=None, counts=None, watermark=None, digest=None):
+        self.sums = dict(sums or {})
+        self.counts = dict(counts or {})
+        self.yoy = {}
+        self.watermark = watermark  # pd.Period('YYYY-MM') 또는 None
+        self.digest = digest        # watermark 까지 반영한 월 행 내용의 해시
+        self._recompute_yoy(self.sums)
+
+    # ---------------------------------------------------------
+    # 저장 / 불러오기
+    # ---------------------------------------------------------
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            # 읽을 수 없는 상태 파일은 빈 상태로 보고 다시 집계합니다.
+            return cls()
+        watermark = pd.Period(state['watermark'], freq='M') if state['watermark'] else None
+        return cls(
+            sums={int(y): v for y, v in state['sums'].items()},
+            counts={int(y): v for y, v in state['counts'].items()},
+            watermark=watermark,
+            digest=state.get('digest'),
+        )
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        state = {
+            'watermark': str(self.watermark) if self.watermark is not None else None,
+            'sums': {str(y): v for y, v in self.sums.items()},
+            'counts': {str(y): v for y, v in self.counts.items()},
+            'digest': self.digest,
+        }
+        # 임시 파일에 쓴 뒤 이름을 바꿔 다른 프로세스가 반쯤 쓴 파일을 읽지 않게 합니다.
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp, path)
+
+    # ---------------------------------------------------------
+    # 증분 갱신
+    # ---------------------------------------------------------
+    @traced('aggregate', 'AnnualAggregateStore.update')
+    def update(self, monthly_df, value_column):
+        """watermark 이후의 월만 더하고, 변경된 년도 목록을 돌려준다."""
+        df = monthly_df.dropna(subset=[PERIOD_COLUMN])
+
+        if self.watermark is not None:
+            # 이미 반영한 기간의 내용이 달라졌으면(과거 월 수정·추가·삭제) 처음부터 다시 집계합니다.
+            seen = df[PERIOD_COLUMN] <= self.watermark
+            if _rows_digest(df[seen], value_column) != self.digest:
+                return self.rebuild(monthly_df, value_column)
+            df = df[~seen]
+
+        if df.empty:
+            return []
+
+        # float32 발생량은 float64 로 합산합니다.
+        values = df[value_column].astype('float64')
+        grouped = values.groupby(df[PERIOD_COLUMN].dt.year).agg(['sum', 'count'])
+        for year, total, count in zip(grouped.index, grouped['sum'], grouped['count']):
+            year = int(year)
+            self.sums[year] = self.sums.get(year, 0.0) + float(total)
+            self.counts[year] = self.counts.get(year, 0) + int(count)
+
+        self.watermark = df[PERIOD_COLUMN].max()
+        self.digest = _rows_digest(monthly_df[monthly_df[PERIOD_COLUMN] <= self.watermark], value_column)
+        changed = sorted(int(y) for y in grouped.index)
+        self._recompute_yoy(changed)
+        return changed
+
+    def rebuild(self, monthly_df, value_column):
+        """저장된 집계를 버리고 전체 기간을 다시 집계한다."""
+        self.sums, self.counts, self.yoy = {}, {}, {}
+        self.watermark, self.digest = None, None
+        return self.update(monthly_df, value_column)
+
+    def _recompute_yoy(self, changed_years):
+        # 바뀐 년도와 그 다음 년도의 전년 대비 증감률만 다시 계산합니다.
+        years = sorted(self.sums)
+        targets = set()
+        for year in changed_years:
+            position = years.index(year)
+            targets.update(years[position:position + 2])
+        for year in targets:
+            position = years.index(year)
+            if position == 0:
+                self.yoy[year] = 0.0
+            else:
+                previous = self.sums[years[position - 1]]
+                self.yoy[year] = (self.sums[year] / previous - 1) * 100 if previous else 0.0
+
+    def to_frame(self):
+        years = sorted(self.sums)
+        return pd.DataFrame({
+            '년도': years,
+            '총_발생량': [self.sums[y] for y in years],
+            '개수': [self.counts[y] for y in years],
+            '평균': [self.sums[y] / self.counts[y] if self.counts[y] else float('nan') for y in years],
+            '전년_대비_증감률': [self.yoy[y] for y in years],
+        })
+
+
+def _rows_digest(df, value_column):
+    # 행 순서와 무관하도록 월 순으로 정렬한 (월, 값) 의 해시
+    rows = df[[PERIOD_COLUMN, value_column]].sort_values(PERIOD_COLUMN, kind='stable')
+    hashed = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def store_path(district=DEFAULT_DISTRICT, value_column='SUM'):
+    return os.path.join(AGGREGATE_DIR, f"annual-{district}-{value_column}.json")
+
+
+def annual_aggregates(district=DEFAULT_DISTRICT, value_column='SUM'):
+    """저장된 년도별 집계에 새 월 데이터만 반영한 표 (년도, 총_발생량, 개수, 평균, 전년_대비_증감률)."""
+    path = store_path(district, value_column)
+    store = AnnualAggregateStore.load(path)
+    if store.update(load_waste_monthly(waste_monthly_file(district)), value_column):
+        store.save(path)
+    return store.to_frame()
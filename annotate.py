@@ -0,0 +1,48 @@
+# 공통 데이터 레이블 : iterrows 로 점마다 ax.text 를 호출하던 코드를 대체
+
+from functools import lru_cache
+
+import numpy as np
+
+# 한 그래프에 표시할 최대 레이블 수 (점이 더 많으면 간격을 두고 표시)
+MAX_LABELS = 40
+
+
+@lru_cache(maxsize=8192)
+def format_label(value, fmt):
+    """같은 값·형식의 레이블 문자열은 한 번만 만든다."""
+    return fmt.format(value)
+
+
+def thin_indices(n, max_labels=MAX_LABELS):
+    """n 개 중 최대 max_labels 개를 같은 간격으로 고른 위치 (마지막 점은 항상 포함)."""
+    if max_labels is None or n <= max_labels:
+        return np.arange(n)
+    stride = -(-n // max_labels)
+    return np.unique(np.r_[np.arange(0, n, stride), n - 1])
+
+
+def annotate_points(ax, x, y, fmt='{:,.0f}', labels=None, max_labels=MAX_LABELS, va='bottom', **text_kw):
+    """(x, y) 점 위에 레이블을 한 번에 표시하고 생성된 Text 목록을 돌려준다.
+
+    labels 를 주지 않으면 y 값을 fmt 로 변환하고, va='sign' 이면
+    값이 0 이상일 때 'bottom', 음수일 때 'top' 으로 정렬한다.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    keep = thin_indices(len(y), max_labels)
+
+    if labels is None:
+        labels = [format_label(v.item(), fmt) for v in y[keep]]
+    else:
+        labels = [labels[i] for i in keep]
+
+    if va == 'sign':
+        alignments = np.where(y[keep] >= 0, 'bottom', 'top')
+    else:
+        alignments = np.full(len(keep), va)
+
+    return [
+        ax.text(px, py, label, va=align, **text_kw)
+        for px, py, label, align in zip(x[keep], y[keep], labels, alignments)
+    ]
@@ -0,0 +1,190 @@
+# 이상치 탐지 : 월별 생활쓰레기(SUM / 매립 / 소각)와 음식물 / 재활용 계열을 새 달이 들어올 때마다 점수화
+#
+# 계열마다 수준(level), 월별 계절 성분(12칸), 잔차 분산을 지수 가중으로 들고 있어서
+# 새 관측 하나를 반영하는 비용은 계열당 O(1) 입니다. (과거 월을 다시 읽지 않음)
+#   예측 = 수준 + 계절[월],  z = (관측 - 예측) / √잔차분산
+# 모든 계열을 (계열,) 배열로 한꺼번에 갱신하므로 자치구 × 종류 계열이 수천 개여도 한 달에 배열 연산 몇 번입니다.
+# 상태는 data/.cache/anomaly 에 저장되고, 다음 실행은 계열마다 그 계열이 마지막으로 관측된 달(last_seen) 이후만 처리합니다.
+# 그래서 자료가 늦게 들어오는 계열(음식물 / 재활용)이나 나중에 추가된 자치구도 한 번에 처리한 것과 같은 결과가 나옵니다.
+# 빠진 달(값 없음)은 그 계열의 다음 관측이 들어왔을 때 알리므로, 자료가 아직 끝난 달까지만 있는 계열은 알리지 않습니다.
+#
+# 사용 예) python anomaly.py              # 새로 들어온 달만 점수화
+#          python anomaly.py --reset      # 처음부터 다시 학습
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CACHE_DIR
+from correlation import WASTE_TYPES
+from seasonal import PERIOD, series_matrix
+
+ANOMALY_DIR = os.path.join(CACHE_DIR, "anomaly")
+STATE_FILE = os.path.join(ANOMALY_DIR, "state.npz")
+KEYS_FILE = os.path.join(ANOMALY_DIR, "keys.json")
+
+LEVEL_ALPHA = 0.3      # 수준 갱신 비율
+SEASON_GAMMA = 0.5     # 계절 성분 갱신 비율 (같은 달은 1년에 한 번만 오므로 크게)
+VARIANCE_BETA = 0.1    # 잔차 분산 갱신 비율
+WARMUP = PERIOD // 2   # 이 개수만큼 관측한 뒤부터 점수화
+THRESHOLD = 3.5        # |z| 가 이 값을 넘으면 이상치
+
+SPIKE = '급증'
+DROP = '급감'
+MISSING = '값 없음'
+ANOMALY_COLUMNS = ['자치구', '종류', '날짜', '값', '예측', 'z', '판정']
+
+
+class SeasonalDetector:
+    """계열별 수준 / 월별 계절 성분 / 잔차 분산을 지수 가중으로 갱신하는 온라인 이상치 탐지기."""
+
+    STATE_ARRAYS = ('level', 'season', 'variance', 'count', 'last_seen')
+
+    def __init__(self, keys, threshold=THRESHOLD):
+        self.keys = [tuple(k) for k in keys]
+        self.threshold = threshold
+        n = len(self.keys)
+        self.level = np.full(n, np.nan)
+        self.season = np.zeros((n, PERIOD))
+        self.variance = np.full(n, np.nan)
+        self.count = np.zeros(n, dtype=np.int64)       # 반영한 관측 수
+        self.last_seen = np.full(n, -1, dtype=np.int64)  # 계열별 마지막 관측 월 ordinal (계열별 watermark)
+
+    @property
+    def latest(self):
+        """어느 계열이든 마지막으로 관측된 월 (없으면 None)."""
+        if not len(self.last_seen) or self.last_seen.max() < 0:
+            return None
+        return pd.Period(ordinal=int(self.last_seen.max()), freq='M')
+
+    def gaps(self, period, values):
+        """이번 달 값이 들어온 계열 중 지난 관측과 이번 달 사이에 빠진 달이 있는 계열 mask."""
+        observed = ~np.isnan(np.asarray(values, dtype='float64'))
+        return observed & (self.last_seen >= 0) & (self.last_seen < period.ordinal - 1)
+
+    def update(self, period, values):
+        """한 달 치 관측 (계열,) 을 반영하고 (예측, z, 판정) 배열을 돌려준다. NaN 은 관측 없음."""
+        values = np.asarray(values, dtype='float64')
+        month = period.month - 1
+        observed = ~np.isnan(values)
+
+        prediction = self.level + self.season[:, month]
+        residual = values - prediction
+        scored = observed & (self.count >= WARMUP) & (self.variance > 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where(scored, residual / np.sqrt(self.variance), np.nan)
+
+        verdict = np.full(len(values), '', dtype=object)
+        verdict[scored & (z > self.threshold)] = SPIKE
+        verdict[scored & (z < -self.threshold)] = DROP
+
+        # 이상치가 상태를 끌고 가지 않도록 잔차를 임계값 안으로 잘라서 반영합니다.
+        first = observed & (self.count == 0)
+        update = observed & ~first
+        bound = np.where(np.isnan(self.variance), np.inf, self.threshold * np.sqrt(self.variance))
+        clipped = np.clip(np.nan_to_num(residual), -bound, bound)
+        target = prediction + clipped  # 반영할 (잘린) 관측값
+
+        level = np.where(update, self.level + LEVEL_ALPHA * (target - self.season[:, month] - self.level), self.level)
+        self.season[:, month] = np.where(update, self.season[:, month] + SEASON_GAMMA * (target - level - self.season[:, month]),
+                                         self.season[:, month])
+        self.level = np.where(first, values, level)
+
+        squared = clipped ** 2
+        self.variance = np.where(update & np.isnan(self.variance), squared, self.variance)
+        self.variance = np.where(update & (self.count > 1), self.variance + VARIANCE_BETA * (squared - self.variance),
+                                 self.variance)
+
+        self.count += observed
+        self.last_seen = np.where(observed, period.ordinal, self.last_seen)
+        return prediction, z, verdict
+
+    # --- 저장 / 불러오기 ---
+
+    def save(self, state_file=STATE_FILE, keys_file=KEYS_FILE):
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        np.savez(state_file, **{name: getattr(self, name) for name in self.STATE_ARRAYS})
+        with open(keys_file, 'w', encoding='utf-8') as f:
+            json.dump({'keys': self.keys, 'threshold': self.threshold}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, keys, state_file=STATE_FILE, keys_file=KEYS_FILE):
+        """저장된 상태를 불러와 keys 순서로 맞춘다. 처음 보는 계열은 빈 상태로 시작한다."""
+        detector = cls(keys)
+        if not (os.path.exists(state_file) and os.path.exists(keys_file)):
+            return detector
+        with open(keys_file, encoding='utf-8') as f:
+            meta = json.load(f)
+        saved = {tuple(k): i for i, k in enumerate(meta['keys'])}
+        detector.threshold = meta['threshold']
+
+        new_pos = np.array([i for i, k in enumerate(detector.keys) if k in saved], dtype=np.intp)
+        old_pos = np.array([saved[detector.keys[i]] for i in new_pos], dtype=np.intp)
+        with np.load(state_file) as state:
+            for name in cls.STATE_ARRAYS:
+                getattr(detector, name)[new_pos] = state[name][old_pos]
+        return detector
+
+
+# -------------------------------------------------------------
+# 2. 월 단위 스트림 처리
+# -------------------------------------------------------------
+
+def score_months(detector, periods, matrix):
+    """(계열 × 월) 행렬에서 계열마다 last_seen 이후 달만 차례로 반영하고 이상치 표를 돌려준다."""
+    rows = []
+    start = detector.last_seen.min() if len(detector.last_seen) else -1
+    for t, period in enumerate(periods):
+        if period.ordinal <= start:
+            continue
+        # 이미 반영한 달은 관측 없음(NaN)으로 넘겨 상태를 다시 움직이지 않습니다.
+        values = np.where(period.ordinal > detector.last_seen, matrix[:, t], np.nan)
+        for i in np.flatnonzero(detector.gaps(period, values)):
+            district, waste_type = detector.keys[i]
+            for ordinal in range(detector.last_seen[i] + 1, period.ordinal):
+                rows.append((district, waste_type, pd.Period(ordinal=ordinal, freq='M'),
+                             np.nan, np.nan, np.nan, MISSING))
+        prediction, z, verdict = detector.update(period, values)
+        for i in np.flatnonzero(verdict != ''):
+            district, waste_type = detector.keys[i]
+            rows.append((district, waste_type, period, values[i], prediction[i], z[i], verdict[i]))
+    anomalies = pd.DataFrame(rows, columns=ANOMALY_COLUMNS)
+    # 빠진 달은 다음 관측 때 알게 되므로 날짜 순으로 다시 정렬합니다.
+    return anomalies.sort_values('날짜', kind='stable', ignore_index=True)
+
+
+def detect_anomalies(dataset=None, districts=None, waste_types=WASTE_TYPES):
+    """저장된 상태 없이 전체 기간을 처음부터 점수화한 이상치 표."""
+    keys, periods, matrix = series_matrix(dataset, districts, waste_types)
+    return score_months(SeasonalDetector(keys), periods, matrix)
+
+
+def update_anomalies(dataset=None, reset=False):
+    """저장된 상태에 계열별로 마지막 관측 이후 달만 반영하고 (이상치 표, 탐지기)를 돌려준다."""
+    keys, periods, matrix = series_matrix(dataset)
+    detector = SeasonalDetector(keys) if reset else SeasonalDetector.load(keys)
+    anomalies = score_months(detector, periods, matrix)
+    detector.save()
+    return anomalies, detector
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="월별 쓰레기 계열 온라인 이상치 탐지")
+    parser.add_argument('--reset', action='store_true', help='저장된 상태를 버리고 처음부터 다시 학습합니다.')
+    parser.add_argument('--out', default=None, help='이상치 표를 저장할 CSV 경로')
+    args = parser.parse_args(argv)
+
+    anomalies, detector = update_anomalies(reset=args.reset)
+    print(f"계열 {len(detector.keys)}개, 마지막 관측 {detector.latest}, 이상치 {len(anomalies)}건")
+    if not anomalies.empty:
+        print(anomalies.to_markdown(index=False, numalign="left", stralign="left", floatfmt=",.2f"))
+    if args.out:
+        anomalies.to_csv(args.out, index=False, encoding='utf-8-sig')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,66 +1,67 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from data_loader import food_recycled_file, DEFAULT_DISTRICT
+from dataset import load_dataset
+from plot_style import setup_fonts
+from profiling import traced
 
 # 파일 이름 정의
-file_name = "./data/서울특별시 종로구_음식물류폐기물 및 재활용품 발생량.csv"
+DISTRICT = DEFAULT_DISTRICT
+file_name = food_recycled_file(DISTRICT)
 
-try:
-    # 널리 사용되는 나눔고딕으로 설정 (설치 필요)
-    plt.rcParams['font.family'] = 'NanumGothic'
-    # 폰트가 없으면 'Malgun Gothic' (Windows 기본 폰트)으로 시도
-    if 'NanumGothic' not in [f.name for f in fm.fontManager.ttflist]:
-        plt.rcParams['font.family'] = 'Malgun Gothic'
-except:
-    # 모든 설정이 실패할 경우를 대비 (최소한의 오류 회피)
-    pass
 
-# 마이너스 기호 깨짐 방지 설정 (폰트 설정 후 필수)
-plt.rcParams['axes.unicode_minus'] = False
-# =======================================================
+@traced('load')
+def load_data(district=DISTRICT):
+    # 1. ~ 3. 데이터 로드 (컬럼 이름 정리, 날짜/숫자 변환은 데이터셋을 만들 때 한 번만 수행)
+    df = load_dataset().food_recycled_for(district)
 
-# 1. 데이터 로드 및 컬럼 이름 정리
-df = pd.read_csv(file_name)
-df.columns = ['Month_Year', 'Food_Waste', 'Recycled_Waste']
+    # 'Date'(Period[M]) 컬럼을 그래프용 시각으로 바꿔 인덱스로 설정
+    # (변환 실패 행 수는 로더가 경고로 알려 줍니다)
+    df = df.dropna(subset=['Date'])
+    df['Date'] = df['Date'].dt.to_timestamp()
+    df.set_index('Date', inplace=True)
+    return df
 
-# 2. 'Month_Year' 컬럼을 Datetime 객체로 변환하고 인덱스로 설정
-df['Date'] = pd.to_datetime(df['Month_Year'], errors='coerce')
-df = df.dropna(subset=['Date'])
-df.set_index('Date', inplace=True)
 
-# 3. 쓰레기 발생량 컬럼을 숫자형으로 변환
-df['Food_Waste'] = pd.to_numeric(df['Food_Waste'], errors='coerce')
-df['Recycled_Waste'] = pd.to_numeric(df['Recycled_Waste'], errors='coerce')
+@traced('plot')
+def plot(df, district=DISTRICT):
+    import matplotlib.pyplot as plt  # 그림을 그릴 때만 불러옵니다.
 
-# 4. 꺾은선 그래프 생성
-plt.figure(figsize=(12, 6))
+    # 4. 꺾은선 그래프 생성
+    fig = plt.figure(figsize=(12, 6))
 
-# 그래프 플롯
-plt.plot(
-    df.index,
-    df['Food_Waste'],
-    label='음식물 쓰레기 (Food Waste)',
-    marker='o',
-    markersize=4,
-    color='red',
-)
-plt.plot(
-    df.index,
-    df['Recycled_Waste'],
-    label='재활용 쓰레기 (Recycled Waste)',
-    marker='x',
-    markersize=4,
-    color='green',
-)
+    # 그래프 플롯
+    plt.plot(
+        df.index,
+        df['Food_Waste'],
+        label='음식물 쓰레기 (Food Waste)',
+        marker='o',
+        markersize=4,
+        color='red',
+    )
+    plt.plot(
+        df.index,
+        df['Recycled_Waste'],
+        label='재활용 쓰레기 (Recycled Waste)',
+        marker='x',
+        markersize=4,
+        color='green',
+    )
 
-# 5. 그래프 포맷팅
-plt.title('종로구 월별 음식물 및 재활용 쓰레기 발생량 변화', fontsize=15)
-plt.xlabel('기간', fontsize=12)
-plt.ylabel('발생량 (톤)', fontsize=12)
-plt.legend(fontsize=10)
-plt.grid(True, linestyle='--', alpha=0.7)
+    # 5. 그래프 포맷팅
+    plt.title(f'{district} 월별 음식물 및 재활용 쓰레기 발생량 변화', fontsize=15)
+    plt.xlabel('기간', fontsize=12)
+    plt.ylabel('발생량 (톤)', fontsize=12)
+    plt.legend(fontsize=10)
+    plt.grid(True, linestyle='--', alpha=0.7)
 
-# 그래프 저장
-plt.show()
-plt.tight_layout()
-# plt.savefig('월별_음식물_재활용_쓰레기_변화_그래프_한글수정.png')
+    plt.tight_layout()
+    return fig
+
+
+if __name__ == '__main__':
+    # 한글 폰트 설정 (나눔고딕 / 맑은 고딕 등 설치된 폰트를 한 번만 검색)
+    import matplotlib.pyplot as plt
+    setup_fonts()
+    plot(load_data())
+
+    # 그래프 저장은 render.py 의 배치 렌더링을 사용합니다.
+    plt.show()
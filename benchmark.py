@@ -0,0 +1,287 @@
+# 성능 측정 : 실제 원본과 같은 형식의 가상 데이터를 규모별로 만들어 단계별 처리량 / 메모리 증가량을 측정
+#
+# 사용 예) python benchmark.py --scales 1 25 1000              # 측정 후 기준값과 비교
+#          python benchmark.py --scales 1 25 1000 --save-baseline  # 현재 결과를 기준값으로 저장
+#
+# 규모 1 은 자치구 1개(현재 원본 규모), 25 는 서울 전체, 1000 은 전국 규모 가정입니다.
+# 규모마다 새 프로세스에서 실행하고, 메모리는 단계 전후의 현재 RSS 차이로 잽니다.
+# (ru_maxrss 는 프로세스 전체의 최대값이라 가장 큰 단계 이후 단계가 모두 같은 값이 되므로 쓰지 않습니다.)
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_loader import WASTE_MONTHLY_TEMPLATE, FOOD_RECYCLED_TEMPLATE, WASTE_VALUE_COLUMNS, TIME_COLUMN, CACHE_DIR
+from profiling import current_rss_kb
+
+SCALES = (1, 25, 1000)
+STAGES = ('load', 'reshape', 'aggregate', 'correlate', 'render')
+# 측정 환경마다 값이 다르므로 저장소가 아닌 캐시 폴더(git 제외)에 둡니다.
+BASELINE_FILE = os.path.join(CACHE_DIR, "benchmark_baseline.json")
+# 처리량이 기준보다 이만큼 낮거나, 단계의 메모리 증가량이 이만큼 크면 성능 저하로 봅니다.
+TOLERANCE = 0.25
+# 메모리 증가량이 작은 단계는 비율만으로 비교하면 흔들리므로 이만큼(MB)은 더 봐 줍니다.
+RSS_SLACK_MB = 16
+
+# 가상 데이터 형식 (실제 1인 가구 파일과 같은 년도 / 연령대 구성)
+YEARS = [2024, 2023, 2022, 2021, 2020, 2019, 2018, 2017, 2016, 2015, 2010]
+BANDS = ['20세미만', '20~24세', '25~29세', '30~34세', '35~39세', '40~44세', '45~49세', '50~54세',
+         '55~59세', '60~64세', '65~69세', '70~74세', '75~79세', '80~84세', '85세이상']
+FIRST_MONTH = '2019-01'
+N_MONTHS = 78
+# 차트는 규모와 상관없이 자치구 몇 개만 그려 봅니다.
+RENDER_LIMIT = 4
+SEED = 0
+
+
+# -------------------------------------------------------------
+# 1. 가상 데이터 생성
+# -------------------------------------------------------------
+
+def district_names(n):
+    return [f"가상{i:04d}구" for i in range(n)]
+
+
+def write_household_csv(path, districts, rng, years=YEARS, bands=BANDS):
+    """헤더 3행(년도 / 합계 / 연령대) + (자치구 × 성별) 행 형식의 1인 가구 CSV."""
+    n_cols = len(bands) + 1  # 소계 + 연령대
+    header = [
+        ['자치구별(1)', '자치구별(2)', '성별(1)'] + [str(y) for y in years for _ in range(n_cols)],
+        ['자치구별(1)', '자치구별(2)', '성별(1)'] + ['합계'] * (len(years) * n_cols),
+        ['자치구별(1)', '자치구별(2)', '성별(1)'] + (['소계'] + bands) * len(years),
+    ]
+    # (자치구, 성별[남/여], 년도, 연령대) 가구 수 → 계 = 남 + 여, 소계 = 연령대 합
+    by_sex = rng.integers(100, 3000, size=(len(districts), 2, len(years), len(bands)))
+    counts = np.concatenate([by_sex.sum(axis=1, keepdims=True), by_sex], axis=1)
+    counts = np.concatenate([counts.sum(axis=-1, keepdims=True), counts], axis=-1)
+    counts = counts.reshape(len(districts), 3, -1)
+
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerows(header)
+        for i, district in enumerate(districts):
+            for s, sex in enumerate(['계', '남자', '여자']):
+                writer.writerow(['합계', district, sex] + counts[i, s].tolist())
+
+
+def write_waste_csvs(directory, districts, rng, n_months=N_MONTHS):
+    """자치구별 월별 생활쓰레기 CSV ('19-Jan' 형식) 와 음식물 / 재활용 CSV (헤더 없음, ISO 날짜)."""
+    periods = pd.period_range(FIRST_MONTH, periods=n_months, freq='M')
+    months = periods.strftime('%y-%b')
+    iso = periods.strftime('%Y-%m-01')
+    for district in districts:
+        reclaimed = rng.uniform(100, 1500, n_months).round(2)
+        incineration = rng.uniform(1500, 3200, n_months).round(2)
+        pd.DataFrame({
+            TIME_COLUMN: months,
+            WASTE_VALUE_COLUMNS[0]: (reclaimed + incineration).round(2),
+            WASTE_VALUE_COLUMNS[1]: reclaimed,
+            WASTE_VALUE_COLUMNS[2]: incineration,
+        }).to_csv(waste_file(directory, district), index=False, encoding='utf-8')
+        pd.DataFrame({
+            'Month_Year': iso,
+            'Food_Waste': rng.uniform(1500, 2200, n_months).round(2),
+            'Recycled_Waste': rng.uniform(600, 950, n_months).round(2),
+        }).to_csv(food_file(directory, district), index=False, header=False, encoding='utf-8')
+
+
+def household_file(directory):
+    return os.path.join(directory, "1인가구(연령별).csv")
+
+
+def waste_file(directory, district):
+    return os.path.join(directory, os.path.basename(WASTE_MONTHLY_TEMPLATE).format(district=district))
+
+
+def food_file(directory, district):
+    return os.path.join(directory, os.path.basename(FOOD_RECYCLED_TEMPLATE).format(district=district))
+
+
+def make_fixtures(directory, scale, seed=SEED):
+    """규모(scale)만큼의 자치구로 가상 원본 세트를 만들고 자치구 목록을 돌려준다."""
+    rng = np.random.default_rng(seed)
+    districts = district_names(scale)
+    write_household_csv(household_file(directory), districts, rng)
+    write_waste_csvs(directory, districts, rng)
+    return districts
+
+
+# -------------------------------------------------------------
+# 2. 단계별 측정
+# -------------------------------------------------------------
+
+def rss_mb():
+    """현재 프로세스의 RSS (MB)."""
+    return current_rss_kb() / 1024
+
+
+def run_scale(scale, seed=SEED):
+    """새 프로세스에서 한 규모를 측정한다. 단계 → {seconds, items, throughput, rss_delta_mb}."""
+    import functools
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    import data_loader
+    from dataset import build_dataset
+    from household import HouseholdIndex, household_long
+    from correlation import correlation_matrix, waste_cube
+    import basic_plot1
+    from plot_style import setup_fonts
+
+    setup_fonts()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='waste-bench-') as directory:
+        districts = make_fixtures(directory, scale, seed)
+        # 측정 중 만든 캐시가 실제 캐시 폴더에 섞이지 않도록 가상 데이터 폴더 안으로 돌립니다.
+        data_loader.CACHE_DIR = os.path.join(directory, '.cache')
+
+        def measure(stage, items, func):
+            rss_before = rss_mb()
+            start = time.perf_counter()
+            value = func()
+            seconds = time.perf_counter() - start
+            results[stage] = {
+                'seconds': seconds,
+                'items': items(value) if callable(items) else items,
+                # 단계가 끝난 뒤 남아 있는 메모리 증가량 (단계 결과를 들고 있는 동안 측정)
+                'rss_delta_mb': rss_mb() - rss_before,
+            }
+            results[stage]['throughput'] = results[stage]['items'] / seconds if seconds else float('inf')
+            return value
+
+        # load: 원본 파싱 (캐시 없음) — 처리량 단위는 입력 행
+        dataset = measure(
+            'load', lambda d: len(d.waste) + len(d.food_recycled) + len(districts) * 3,
+            lambda: build_dataset(
+                districts, household_file(directory),
+                waste_file=functools.partial(waste_file, directory), food_file=functools.partial(food_file, directory),
+            ),
+        )
+        raw = data_loader.load_household_raw(household_file(directory))
+        # reshape: 넓은 1인 가구 표 → 색인 / 긴 표 — 단위는 값 셀
+        measure('reshape', lambda df: len(df), lambda: household_long(HouseholdIndex(raw)))
+        # aggregate: (자치구 × 종류 × 년도) 년도 합계 — 단위는 월 행
+        years = list(range(2010, 2026))
+        measure('aggregate', len(dataset.waste), lambda: waste_cube(dataset, districts, years))
+        # correlate: 자치구 × 연령대 × 종류 × 시차 일괄 회귀 — 단위는 조합 수
+        measure('correlate', lambda m: m['r'].size,
+                lambda: correlation_matrix(districts, dataset=dataset, household_path=household_file(directory)))
+
+        # render: 년도별 추세 차트 — 단위는 그림 수
+        def render():
+            targets = districts[:RENDER_LIMIT]
+            for district in targets:
+                frame = dataset.waste_for(district)
+                annual = frame.groupby(frame['날짜'].dt.year)['SUM'].sum()
+                annual_df = pd.DataFrame({
+                    '년도': annual.index, '총_발생량': annual.to_numpy(),
+                    '전년_대비_증감률': annual.pct_change().fillna(0).to_numpy() * 100,
+                })
+                fig = basic_plot1.plot(annual_df, district)
+                fig.savefig(os.path.join(directory, f"{district}.png"), dpi=100)
+                plt.close(fig)
+            return targets
+        measure('render', len, render)
+    return results
+
+
+def run_benchmarks(scales=SCALES, seed=SEED):
+    """규모마다 새 프로세스(spawn)에서 측정한 결과 {규모: {단계: 측정값}}."""
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for scale in scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[str(scale)] = pool.submit(run_scale, scale, seed).result()
+    return results
+
+
+# -------------------------------------------------------------
+# 3. 기준값 비교
+# -------------------------------------------------------------
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    baseline = load_baseline(path)
+    baseline.update(results)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """기준값 대비 처리량이 떨어지거나 메모리 증가량이 늘어난 (규모, 단계, 항목, 현재, 기준) 목록."""
+    regressions = []
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            reference = baseline.get(scale, {}).get(stage)
+            if reference is None:
+                continue
+            if current['throughput'] < reference['throughput'] * (1 - tolerance):
+                regressions.append((scale, stage, 'throughput', current['throughput'], reference['throughput']))
+            # 이전 형식(peak_rss_mb)으로 저장한 기준값은 메모리를 비교하지 않습니다.
+            if 'rss_delta_mb' not in reference:
+                continue
+            limit = max(reference['rss_delta_mb'], 0) * (1 + tolerance) + RSS_SLACK_MB
+            if current['rss_delta_mb'] > limit:
+                regressions.append((scale, stage, 'rss_delta_mb', current['rss_delta_mb'], reference['rss_delta_mb']))
+    return regressions
+
+
+def report(results, baseline):
+    rows = []
+    for scale, stages in results.items():
+        for stage in STAGES:
+            current = stages[stage]
+            reference = baseline.get(scale, {}).get(stage, {})
+            rows.append({
+                '규모': scale,
+                '단계': stage,
+                '시간(s)': current['seconds'],
+                '처리량(/s)': current['throughput'],
+                '기준 처리량(/s)': reference.get('throughput'),
+                'RSS 증가(MB)': current['rss_delta_mb'],
+                '기준 RSS 증가(MB)': reference.get('rss_delta_mb'),
+            })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 데이터로 단계별 처리량과 메모리 증가량을 측정합니다.")
+    parser.add_argument('--scales', nargs='+', type=int, default=list(SCALES))
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장합니다.')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales)
+    baseline = load_baseline(args.baseline)
+    print(report(results, baseline).to_markdown(index=False, numalign="right", floatfmt=",.2f"))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for scale, stage, metric, current, reference in regressions:
+        print(f"❌ 규모 {scale} / {stage}: {metric} {current:,.2f} (기준 {reference:,.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
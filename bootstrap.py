@@ -0,0 +1,112 @@
+# 재표본 신뢰구간 : 1인 가구 수 vs 쓰레기 발생량 상관계수의 부트스트랩 구간과 순열 검정 p-value
+#
+# 재표본은 (재표본 수 × 관측 수) 인덱스 행렬 하나로 만들고 상관계수를 행 단위로 한꺼번에 계산합니다.
+# 재표본은 CHUNK_SIZE 개씩 나누고 청크마다 SeedSequence 로 시드를 나눠 주므로,
+# 워커 수와 상관없이 같은 seed 면 같은 결과가 나옵니다.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+CHUNK_SIZE = 10_000
+N_RESAMPLES = 10_000
+CONFIDENCE = 0.95
+SEED = 0
+
+
+# -------------------------------------------------------------
+# 1. 인덱스 행렬 및 일괄 상관계수
+# -------------------------------------------------------------
+
+def bootstrap_indices(rng, n_resamples, n):
+    """복원 추출 인덱스 행렬 (재표본 수 × 관측 수)."""
+    return rng.integers(0, n, size=(n_resamples, n))
+
+
+def permutation_indices(rng, n_resamples, n):
+    """행마다 독립적으로 섞은 순열 인덱스 행렬 (재표본 수 × 관측 수)."""
+    return rng.permuted(np.broadcast_to(np.arange(n), (n_resamples, n)), axis=1)
+
+
+def pearson_rows(x, y):
+    """마지막 축 방향 피어슨 상관계수. 한쪽 분산이 0 인 행은 NaN."""
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (dx * dy).sum(axis=-1) / np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+
+
+def _resample_chunk(kind, x, y, seed_sequence, size):
+    # 워커에서 실행: 청크 하나의 재표본 상관계수 배열
+    rng = np.random.default_rng(seed_sequence)
+    if kind == 'bootstrap':
+        idx = bootstrap_indices(rng, size, len(x))
+        return pearson_rows(x[idx], y[idx])
+    idx = permutation_indices(rng, size, len(x))
+    return pearson_rows(np.broadcast_to(x, idx.shape), y[idx])
+
+
+def resampled_correlations(kind, x, y, n_resamples=N_RESAMPLES, seed=SEED, workers=1, chunk_size=CHUNK_SIZE):
+    """'bootstrap' / 'permutation' 재표본 상관계수 배열. workers > 1 이면 청크를 프로세스 풀에 나눈다."""
+    if kind not in ('bootstrap', 'permutation'):
+        raise ValueError(f"알 수 없는 재표본 방식입니다: {kind}")
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x, y 는 길이가 같은 1차원 배열이어야 합니다.")
+
+    sizes = [chunk_size] * (n_resamples // chunk_size)
+    if n_resamples % chunk_size:
+        sizes.append(n_resamples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(kind, x, y, s, size) for s, size in zip(seeds, sizes)]
+
+    if workers == 1 or len(args) == 1:
+        chunks = [_resample_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_resample_chunk, *zip(*args)))
+    return np.concatenate(chunks)
+
+
+# -------------------------------------------------------------
+# 2. 신뢰구간 / 검정
+# -------------------------------------------------------------
+
+def bootstrap_ci(x, y, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=SEED, workers=1):
+    """상관계수와 백분위 부트스트랩 신뢰구간.
+
+    관측이 적으면 같은 값만 뽑혀 상관계수를 정의할 수 없는 재표본이 생기며, 이는 제외하고 개수를 알려줍니다.
+    """
+    r = pearson_rows(np.asarray(x, dtype='float64'), np.asarray(y, dtype='float64')).item()
+    samples = resampled_correlations('bootstrap', x, y, n_resamples, seed, workers)
+    valid = samples[~np.isnan(samples)]
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(valid, [alpha, 1 - alpha]) if len(valid) else (np.nan, np.nan)
+    return {
+        'r': r,
+        'low': float(low),
+        'high': float(high),
+        'confidence': confidence,
+        'n_resamples': n_resamples,
+        'degenerate': int(len(samples) - len(valid)),
+    }
+
+
+def permutation_test(x, y, n_resamples=N_RESAMPLES, seed=SEED, workers=1):
+    """y 를 섞어 만든 귀무분포에 대한 양측 순열 검정 p-value. 상관계수를 정의할 수 없으면(분산 0) NaN."""
+    r = pearson_rows(np.asarray(x, dtype='float64'), np.asarray(y, dtype='float64')).item()
+    if np.isnan(r):
+        return {'r': r, 'p_value': float('nan'), 'n_resamples': n_resamples}
+    samples = resampled_correlations('permutation', x, y, n_resamples, seed, workers)
+    # 정의되지 않는 재표본 상관계수는 귀무분포에서 뺍니다.
+    valid = samples[~np.isnan(samples)]
+    extreme = np.count_nonzero(np.abs(valid) >= abs(r) - 1e-12)
+    return {'r': r, 'p_value': float((extreme + 1) / (len(valid) + 1)), 'n_resamples': n_resamples}
+
+
+def correlation_intervals(x, y, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=SEED, workers=1):
+    """부트스트랩 신뢰구간과 순열 검정 결과를 한 dict 로 돌려준다."""
+    result = bootstrap_ci(x, y, n_resamples, confidence, seed, workers)
+    result['p_value'] = permutation_test(x, y, n_resamples, seed, workers)['p_value']
+    return result
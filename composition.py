@@ -0,0 +1,113 @@
+# 폐기물 구성 분해 : 생활쓰레기(SUM) / 음식물 / 재활용을 월 기준으로 맞춘 뒤
+# 모든 자치구 × 월 / 년도의 구성량과 비율을 한 번에 계산해 긴 표로 만듦
+#
+# 기타 = 생활쓰레기 합계 - 음식물 - 재활용 이며, 이 값이 음수인 칸(원자료 불일치)은 '음수_잔차' 로 표시합니다.
+# 년도 값은 세 계열이 모두 관측된 월만 사용한 월평균(톤/월) 입니다.
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset import load_dataset
+from seasonal import series_matrix
+
+TOTAL_TYPE = 'SUM'
+PART_TYPES = ['Food_Waste', 'Recycled_Waste']
+COMPONENTS = ['음식물', '재활용', '기타']
+
+# 데이터셋 → 구성 표 (같은 데이터셋이면 다시 계산하지 않음)
+_table_memo = {}
+
+
+def _long_rows(districts, unit, labels, parts, total):
+    # parts: (자치구, 구성, 기간), total: (자치구, 기간) → 긴 표
+    # 값이 없는 (자치구, 기간) 칸은 제외합니다.
+    n_d, n_c, n_p = parts.shape
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = parts / total[:, None, :]
+    negative = np.broadcast_to((parts[:, -1, :] < 0)[:, None, :], parts.shape)
+    frame = pd.DataFrame({
+        '자치구': np.repeat(districts, n_c * n_p),
+        '단위': unit,
+        '기간': np.tile(labels, n_d * n_c),
+        '구성': np.tile(np.repeat(COMPONENTS, n_p), n_d),
+        '발생량': parts.ravel(),
+        '비율': shares.ravel(),
+        '음수_잔차': negative.ravel(),
+    })
+    return frame.dropna(subset=['발생량'])
+
+
+def composition_table(dataset=None, districts=None):
+    """(자치구, 단위[월/년], 기간, 구성) 별 발생량 · 비율 · 음수_잔차 긴 표."""
+    if dataset is None:
+        dataset = load_dataset()
+    if districts is None:
+        districts = dataset.districts
+
+    types = [TOTAL_TYPE] + PART_TYPES
+    _, periods, matrix = series_matrix(dataset, districts, types)
+    matrix = matrix.reshape(len(districts), len(types), len(periods))
+    total, food, recycled = matrix[:, 0], matrix[:, 1], matrix[:, 2]
+
+    # 세 계열이 모두 있는 월만 정렬된 구성으로 인정합니다.
+    aligned = ~(np.isnan(total) | np.isnan(food) | np.isnan(recycled))
+    total = np.where(aligned, total, np.nan)
+    parts = np.stack([food, recycled, total - food - recycled], axis=1)
+    parts = np.where(aligned[:, None, :], parts, np.nan)
+
+    monthly = _long_rows(districts, '월', periods.strftime('%Y-%m'), parts, total)
+
+    # 년도 월평균: 년도 코드 원-핫 행렬 곱 한 번으로 합계 / 개수를 구합니다.
+    years, year_codes = np.unique(periods.year, return_inverse=True)
+    onehot = np.eye(len(years))[year_codes]  # (월, 년도)
+    counts = aligned.astype('float64') @ onehot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        annual_total = np.nan_to_num(total) @ onehot / counts
+        annual_parts = np.nan_to_num(parts) @ onehot / counts[:, None, :]
+    annual = _long_rows(districts, '년', years.astype(str), annual_parts, annual_total)
+
+    table = pd.concat([monthly, annual], ignore_index=True)
+    table['자치구'] = pd.Categorical(table['자치구'], categories=districts)
+    table['단위'] = pd.Categorical(table['단위'], categories=['월', '년'])
+    table['구성'] = pd.Categorical(table['구성'], categories=COMPONENTS)
+    return table
+
+
+def load_composition(dataset=None):
+    """데이터셋이 바뀌지 않았다면 한 번 만든 구성 표를 재사용한다."""
+    if dataset is None:
+        dataset = load_dataset()
+    cached = _table_memo.get(id(dataset))
+    if cached is None or cached[0] is not dataset:
+        cached = (dataset, composition_table(dataset))
+        _table_memo[id(dataset)] = cached
+    return cached[1]
+
+
+def composition_for(district, period, unit='년', table=None):
+    """한 자치구 · 기간의 (음식물, 재활용, 기타) 발생량 목록. 없으면 KeyError."""
+    if table is None:
+        table = load_composition()
+    rows = table[(table['자치구'] == district) & (table['단위'] == unit) & (table['기간'] == str(period))]
+    if rows.empty:
+        raise KeyError(f"{district} {period} 구성 데이터가 없습니다. (음식물 / 재활용 / 생활쓰레기 월이 겹치지 않음)")
+    return rows.set_index('구성')['발생량'].reindex(COMPONENTS).tolist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='자치구별 월 / 년도 폐기물 구성 표를 CSV 로 저장합니다.')
+    parser.add_argument('--out', default=os.path.join('.', 'output', 'composition.csv'))
+    args = parser.parse_args(argv)
+
+    table = load_composition()
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    table.to_csv(args.out, index=False, encoding='utf-8-sig')
+    negative = table[table['음수_잔차'] & (table['구성'] == '기타')]
+    print(f"구성 표 {len(table)}행 저장: {args.out} (기타가 음수인 칸 {len(negative)}개)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# 상관 / 회귀 일괄 계산 : 자치구 × 연령대 × 쓰레기 종류 × 시차(년)를 배열 연산 한 번으로 계산
+#
+# 1인 가구 수 X[자치구, 연령대, 년도] 와 쓰레기 발생량 Y[자치구, 종류, 년도] 를 같은 년도 축에 올린 뒤
+# (자치구, 연령대, 종류, 시차, 년도) 모양으로 브로드캐스트해서 합계만으로 r / 기울기 / 표준오차 / p-value 를 구합니다.
+# scipy.stats.linregress 를 조합마다 호출하지 않습니다.
+
+import numpy as np
+import pandas as pd
+
+from data_loader import WASTE_VALUE_COLUMNS, SINGLE_HOUSEHOLD_FILE
+from dataset import load_dataset
+from household import load_household_index, take_columns, TOTAL_SEX, TOTAL_GROUP
+
+FOOD_RECYCLED_VALUE_COLUMNS = ['Food_Waste', 'Recycled_Waste']
+WASTE_TYPES = WASTE_VALUE_COLUMNS + FOOD_RECYCLED_VALUE_COLUMNS
+LAGS = (0, 1, 2)
+
+RESULT_FIELDS = ['n', 'r', 'slope', 'intercept', 'stderr', 'p_value']
+
+
+# -------------------------------------------------------------
+# 1. 입력 배열 구성
+# -------------------------------------------------------------
+
+def household_cube(index, districts, years, bands=None, sex=TOTAL_SEX):
+    """(자치구 × 연령대 × 년도) 1인 가구 수 배열. 파일에 없는 년도와 그 년도에 없는 연령대는 NaN."""
+    if bands is None:
+        bands = index.bands
+    cube = np.full((len(districts), len(bands), len(years)), np.nan)
+    present = [i for i, y in enumerate(years) if y in index.years]
+    positions = index.column_positions([years[i] for i in present], bands, TOTAL_GROUP, allow_missing=True)  # (년도, 연령대)
+    try:
+        rows = np.array([index.rows[(d, sex)] for d in districts], dtype=np.intp)
+    except KeyError as e:
+        raise KeyError(f"1인 가구 파일에 (자치구, 성별) {e.args[0]} 행이 없습니다.") from None
+    # (자치구, 년도, 연령대) 를 한 번에 가져와 (자치구, 연령대, 년도) 로 바꿉니다.
+    cube[:, :, present] = take_columns(index.values, rows[:, None, None], positions[None]).transpose(0, 2, 1)
+    return cube
+
+
+def _annual_sums(frame, period_column, value_columns, districts, years):
+    # (자치구, 년도)별 합계를 (자치구 × 종류 × 년도) 배열로 펼칩니다. 관측이 없는 칸은 NaN.
+    # 12개월이 다 관측되지 않은 해(자료가 시작 / 끝나는 해, 빠진 달이 있는 해)는 합계가 작게 나오므로 NaN 으로 둡니다.
+    cube = np.full((len(districts), len(value_columns), len(years)), np.nan)
+    if frame.empty:
+        return cube
+    frame = frame.dropna(subset=[period_column])
+    grouped = (
+        frame[value_columns].astype('float64')
+        .groupby([frame['자치구'], frame[period_column].dt.year.rename('년도')], observed=True)
+    )
+    sums = grouped.sum()
+    months = grouped.count()  # 종류별로 값이 있는 달 수
+    d_pos = pd.Index(districts).get_indexer(sums.index.get_level_values(0))
+    y_pos = pd.Index(years).get_indexer(sums.index.get_level_values(1))
+    keep = (d_pos >= 0) & (y_pos >= 0)
+    complete = np.where(months.to_numpy() == 12, sums.to_numpy(), np.nan)
+    cube[d_pos[keep], :, y_pos[keep]] = complete[keep]
+    return cube
+
+
+def waste_cube(dataset, districts, years):
+    """(자치구 × 종류 × 년도) 년도별 쓰레기 발생량 배열. 종류 순서는 WASTE_TYPES, 12개월이 다 없는 해는 NaN."""
+    waste = _annual_sums(dataset.waste, '날짜', WASTE_VALUE_COLUMNS, districts, years)
+    food = _annual_sums(dataset.food_recycled, 'Date', FOOD_RECYCLED_VALUE_COLUMNS, districts, years)
+    return np.concatenate([waste, food], axis=1)
+
+
+def lagged(cube, lags):
+    """마지막(년도) 축을 시차만큼 뒤로 민 배열을 새 축으로 쌓는다. lag=k 이면 t 자리에 t-k 값."""
+    out = np.full(cube.shape[:-1] + (len(lags), cube.shape[-1]), np.nan)
+    for i, lag in enumerate(lags):
+        if lag == 0:
+            out[..., i, :] = cube
+        else:
+            out[..., i, lag:] = cube[..., :-lag]
+    return out
+
+
+# -------------------------------------------------------------
+# 2. 일괄 회귀
+# -------------------------------------------------------------
+
+def batch_linregress(x, y, axis=-1):
+    """x, y 를 브로드캐스트해서 axis 방향으로 단순 선형회귀를 한꺼번에 계산한다.
+
+    NaN 이 있는 관측은 쌍 단위로 제외하며, 결과는 RESULT_FIELDS 이름의 배열 dict 입니다.
+    값은 scipy.stats.linregress 와 같고, 관측이 3개 미만이거나 분산이 0 이면 NaN 입니다.
+    """
+    from scipy.special import stdtr  # p-value 계산 시에만 불러옵니다.
+
+    x, y = np.broadcast_arrays(np.asarray(x, dtype='float64'), np.asarray(y, dtype='float64'))
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    n = valid.sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = x.sum(axis=axis) / n
+        y_mean = y.sum(axis=axis) / n
+        dx = np.where(valid, x - np.expand_dims(x_mean, axis), 0.0)
+        dy = np.where(valid, y - np.expand_dims(y_mean, axis), 0.0)
+        sxx = (dx * dx).sum(axis=axis)
+        syy = (dy * dy).sum(axis=axis)
+        sxy = (dx * dy).sum(axis=axis)
+
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+
+        df = n - 2
+        stderr = np.sqrt((1 - r ** 2) * syy / sxx / df)
+        t = r * np.sqrt(df / ((1 - r) * (1 + r)))
+        p_value = 2 * stdtr(df, -np.abs(t))
+
+    too_few = (n < 3) | (sxx == 0) | (syy == 0)
+    result = {'n': n, 'r': r, 'slope': slope, 'intercept': intercept, 'stderr': stderr, 'p_value': p_value}
+    for name in RESULT_FIELDS[1:]:
+        result[name] = np.where(too_few, np.nan, result[name])
+    return result
+
+
+class CorrelationMatrix:
+    """(자치구, 연령대, 종류, 시차) 축을 가진 상관 / 회귀 결과 배열 묶음."""
+
+    AXES = ('자치구', '연령대', '종류', '시차')
+
+    def __init__(self, districts, bands, waste_types, lags, years, arrays):
+        self.districts = list(districts)
+        self.bands = list(bands)
+        self.waste_types = list(waste_types)
+        self.lags = list(lags)
+        self.years = list(years)
+        self.arrays = arrays  # RESULT_FIELDS → (자치구, 연령대, 종류, 시차) 배열
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    def get(self, district, band, waste_type, lag=0):
+        """한 조합의 결과를 dict 로 돌려준다."""
+        key = (
+            self.districts.index(district), self.bands.index(band),
+            self.waste_types.index(waste_type), self.lags.index(lag),
+        )
+        return {name: self.arrays[name][key].item() for name in RESULT_FIELDS}
+
+    def to_frame(self):
+        """조합별 한 행의 긴 표 (자치구, 연령대, 종류, 시차, n, r, slope, intercept, stderr, p_value)."""
+        grid = pd.MultiIndex.from_product(
+            [self.districts, self.bands, self.waste_types, self.lags], names=self.AXES
+        )
+        frame = pd.DataFrame({name: self.arrays[name].ravel() for name in RESULT_FIELDS}, index=grid)
+        frame['n'] = frame['n'].astype('int32')
+        return frame.reset_index()
+
+
+def correlation_matrix(districts=None, bands=None, lags=LAGS, dataset=None, household_path=SINGLE_HOUSEHOLD_FILE):
+    """모든 자치구 × 연령대 × 쓰레기 종류 × 시차(년)의 상관계수 / 회귀 결과를 한 번에 계산한다.
+
+    시차 k 는 (t-k)년 1인 가구 수와 t년 쓰레기 발생량을 짝짓습니다.
+    """
+    if dataset is None:
+        dataset = load_dataset(household_path=household_path)
+    if districts is None:
+        districts = dataset.districts
+    index = load_household_index(household_path)
+    if bands is None:
+        bands = index.bands
+
+    # 빈 년도가 있어도 시차가 '칸 수'가 아니라 '년 수'가 되도록 연속된 년도 축을 씁니다.
+    waste_years = dataset.waste['날짜'].dropna().dt.year
+    first = min(index.years[0], int(waste_years.min()))
+    last = max(index.years[-1], int(waste_years.max()))
+    years = list(range(first, last + 1))
+
+    x = lagged(household_cube(index, districts, years, bands), lags)  # (자치구, 연령대, 시차, 년도)
+    y = waste_cube(dataset, districts, years)                         # (자치구, 종류, 년도)
+
+    arrays = batch_linregress(
+        x[:, :, None, :, :],   # (자치구, 연령대, 1, 시차, 년도)
+        y[:, None, :, None, :],  # (자치구, 1, 종류, 1, 년도)
+    )
+    return CorrelationMatrix(districts, bands, WASTE_TYPES, lags, years, arrays)
+
+
+if __name__ == '__main__':
+    matrix = correlation_matrix()
+    frame = matrix.to_frame()
+    print(frame.sort_values('p_value').head(20).to_markdown(index=False, numalign="left", stralign="left"))
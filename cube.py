@@ -0,0 +1,260 @@
+# 집계 큐브 : (자치구, 년도, 월, 연령대, 성별, 쓰레기 종류) 축의 합계를 미리 계산해 메모리 맵 파일로 저장
+#
+# - 1인 가구  [자치구(+전체), 년도, 연령대, 성별]        float64 (연령대 '소계', 성별 '계' 가 전체, 그 년도에 없는 연령대는 NaN)
+# - 쓰레기    [자치구(+전체), 년도(+전체), 월(1~12, Q1~Q4, 전체), 종류]  float64 (관측 없는 칸은 NaN)
+# - 관측 월수 [쓰레기와 같은 모양]                       int16
+# 원본이 바뀌지 않았다면 저장된 .npy 를 mmap 으로 열기만 하므로 조회는 배열 인덱싱 한 번입니다.
+#
+# 사용 예)
+#   cube = load_cube()
+#   cube.households('종로구', 2022, band=BANDS_20_30S)              # 2022년 20~30대 1인 가구
+#   cube.waste(year=2023, month='Q3', waste_type='The amount of incineration')  # 전체 자치구 3분기 소각량
+#   cube.yoy('SUM')                                                 # 자치구별 전년 대비 증감률
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CACHE_DIR, SINGLE_HOUSEHOLD_FILE, cache_key
+from dataset import load_dataset, source_paths
+from household import load_household_index, take_columns, TOTAL_BAND, TOTAL_SEX, TOTAL_GROUP
+from correlation import WASTE_TYPES
+from seasonal import series_matrix
+
+CUBE_DIR = os.path.join(CACHE_DIR, "cube")
+# 큐브 구조가 바뀌면 올려서 저장된 큐브를 무효화합니다.
+CUBE_VERSION = 2
+
+ALL = '전체'
+SEXES = ['남자', '여자', TOTAL_SEX]
+MONTH_LABELS = list(range(1, 13)) + ['Q1', 'Q2', 'Q3', 'Q4', ALL]
+
+_cube_memo = {}
+
+
+# -------------------------------------------------------------
+# 1. 롤업 계산
+# -------------------------------------------------------------
+
+def _nansum(values, axis):
+    # 모두 NaN 인 칸은 0 이 아니라 NaN 으로 남깁니다.
+    total = np.nansum(values, axis=axis)
+    return np.where(np.isnan(values).all(axis=axis), np.nan, total)
+
+
+def _with_total(values, axis, reduce=_nansum):
+    """axis 끝에 전체 합계 칸을 하나 덧붙인다."""
+    return np.concatenate([values, np.expand_dims(reduce(values, axis), axis)], axis=axis)
+
+
+def _month_rollups(monthly, axis, reduce=_nansum):
+    # 월 12칸 뒤에 분기 4칸과 전체 1칸을 덧붙입니다.
+    quarters = [reduce(np.take(monthly, range(q * 3, q * 3 + 3), axis=axis), axis) for q in range(4)]
+    extra = np.stack(quarters + [reduce(monthly, axis)], axis=axis)
+    return np.concatenate([monthly, extra], axis=axis)
+
+
+def build_cube_arrays(dataset=None, household_path=SINGLE_HOUSEHOLD_FILE):
+    """큐브 배열 dict 와 축 이름표 dict 를 만든다."""
+    if dataset is None:
+        dataset = load_dataset(household_path=household_path)
+    districts = list(dataset.districts)
+    index = load_household_index(household_path)
+
+    # 1인 가구: 색인 값 행렬에서 (자치구, 성별) 행 × (년도, 연령대) 열을 한 번에 모읍니다.
+    years_h = index.years
+    bands = index.bands
+    rows = np.array([[index.rows[(d, s)] for s in SEXES] for d in districts], dtype=np.intp)  # (자치구, 성별)
+    columns = index.column_positions(years_h, bands, TOTAL_GROUP, allow_missing=True)        # (년도, 연령대)
+    household = take_columns(index.values, rows[:, :, None, None], columns[None, None])     # (자치구, 성별, 년도, 연령대)
+    household = household.transpose(0, 2, 3, 1)                                             # (자치구, 년도, 연령대, 성별)
+    household = np.concatenate([household, household.sum(axis=0, keepdims=True)], axis=0)
+
+    # 쓰레기: (자치구 × 종류, 월) 행렬을 (자치구, 년도, 월, 종류) 로 펼친 뒤 롤업을 붙입니다.
+    _, periods, matrix = series_matrix(dataset, districts, WASTE_TYPES)
+    years_w = list(range(periods[0].year, periods[-1].year + 1))
+    grid = np.full((len(districts), len(WASTE_TYPES), len(years_w) * 12), np.nan)
+    offset = periods[0].month - 1
+    grid[:, :, offset:offset + len(periods)] = matrix.reshape(len(districts), len(WASTE_TYPES), len(periods))
+    waste = grid.reshape(len(districts), len(WASTE_TYPES), len(years_w), 12).transpose(0, 2, 3, 1)
+
+    observed = (~np.isnan(waste)).astype(np.int16)
+    count = lambda values, axis: values.sum(axis=axis, dtype=np.int16)  # noqa: E731
+    waste = _with_total(_with_total(_month_rollups(waste, 2), 1), 0)
+    observed = _with_total(_with_total(_month_rollups(observed, 2, count), 1, count), 0, count)
+
+    arrays = {'household': household, 'waste': waste, 'months_observed': observed}
+    labels = {
+        'district': districts + [ALL],
+        'household_year': [int(y) for y in years_h],
+        'band': list(bands),
+        'sex': SEXES,
+        'waste_year': years_w + [ALL],
+        'month': MONTH_LABELS,
+        'waste_type': list(WASTE_TYPES),
+    }
+    return arrays, labels
+
+
+# -------------------------------------------------------------
+# 2. 조회 API
+# -------------------------------------------------------------
+
+class AggregateCube:
+    """미리 계산한 집계 배열(메모리 맵)과 축 이름표. 선택 값이 None 이면 전체, 목록이면 합계."""
+
+    def __init__(self, arrays, labels):
+        self.arrays = arrays
+        self.labels = labels
+        self.positions = {dim: {label: i for i, label in enumerate(values)} for dim, values in labels.items()}
+
+    def _position(self, dim, value, total=ALL):
+        if value is None:
+            value = total
+        if isinstance(value, (list, tuple)):
+            return [self._position(dim, v) for v in value]
+        try:
+            return self.positions[dim][value]
+        except KeyError:
+            raise KeyError(f"'{dim}' 축에 '{value}' 값이 없습니다. (사용 가능: {self.labels[dim]})") from None
+
+    @staticmethod
+    def _collapse(selected):
+        # 목록으로 고른 축은 합산해서 스칼라로 돌려줍니다.
+        if np.ndim(selected) == 0:
+            return selected.item()
+        if np.issubdtype(selected.dtype, np.integer):
+            return int(selected.sum())
+        return float(_nansum(np.ravel(selected), 0))
+
+    def households(self, district=None, year=None, band=None, sex=None):
+        """1인 가구 수. 연령대 None 은 '소계', 성별 None 은 '계'. 년도는 지정해야 하고, 그 년도에 없는 연령대는 NaN."""
+        if year is None:
+            raise ValueError("1인 가구 수는 년도별 값이므로 year 를 지정해야 합니다.")
+        key = (
+            self._position('district', district),
+            self._position('household_year', year),
+            self._position('band', band, TOTAL_BAND),
+            self._position('sex', sex, TOTAL_SEX),
+        )
+        return self._collapse(self._take(self.arrays['household'], key))
+
+    def waste(self, district=None, year=None, month=None, waste_type='SUM'):
+        """쓰레기 발생량(톤) 합계. month 는 1~12, 'Q1'~'Q4', None(전체)."""
+        key = (
+            self._position('district', district),
+            self._position('waste_year', year),
+            self._position('month', month),
+            self._position('waste_type', waste_type),
+        )
+        return self._collapse(self._take(self.arrays['waste'], key))
+
+    def months_observed(self, district=None, year=None, month=None, waste_type='SUM'):
+        """해당 칸에 실제로 관측된 월 수."""
+        key = (
+            self._position('district', district),
+            self._position('waste_year', year),
+            self._position('month', month),
+            self._position('waste_type', waste_type),
+        )
+        return int(np.sum(self._take(self.arrays['months_observed'], key)))
+
+    @staticmethod
+    def _take(array, key):
+        # 목록이 하나 이하면 인덱싱 한 번, 여러 개면 축별로 차례로 고릅니다. (목록끼리 브로드캐스트되지 않도록)
+        if sum(isinstance(k, list) for k in key) <= 1:
+            return array[key]
+        selected = array
+        for axis, k in reversed(list(enumerate(key))):
+            selected = np.take(selected, k, axis=axis)
+        return selected
+
+    def yoy(self, waste_type='SUM'):
+        """(자치구, 년도)별 연간 발생량 · 관측 월수 · 전년 대비 증감률(%). 12개월이 모두 있는 해만 증감률을 계산."""
+        t = self._position('waste_type', waste_type)
+        total = self.positions['month'][ALL]
+        years = self.labels['waste_year'][:-1]
+        annual = np.asarray(self.arrays['waste'][:, :len(years), total, t])
+        months = np.asarray(self.arrays['months_observed'][:, :len(years), total, t])
+        complete = np.where(months == 12, annual, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = np.full(annual.shape, np.nan)
+            change[:, 1:] = (complete[:, 1:] / complete[:, :-1] - 1) * 100
+        n_d = len(self.labels['district'])
+        return pd.DataFrame({
+            '자치구': np.repeat(self.labels['district'], len(years)),
+            '년도': np.tile(years, n_d),
+            '발생량': annual.ravel(),
+            '관측_월수': months.ravel(),
+            '전년_대비_증감률': change.ravel(),
+        })
+
+
+# -------------------------------------------------------------
+# 3. 저장 / 불러오기
+# -------------------------------------------------------------
+
+def _source_key(districts, household_path):
+    raw = '|'.join([str(CUBE_VERSION)] + [cache_key(p) for p in source_paths(districts, household_path)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def save_cube(arrays, labels, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    with open(os.path.join(directory, 'labels.json'), 'w', encoding='utf-8') as f:
+        json.dump(labels, f, ensure_ascii=False)
+
+
+def open_cube(directory):
+    """저장된 큐브를 메모리 맵(읽기 전용)으로 연다."""
+    with open(os.path.join(directory, 'labels.json'), encoding='utf-8') as f:
+        labels = json.load(f)
+    arrays = {
+        os.path.splitext(os.path.basename(path))[0]: np.load(path, mmap_mode='r')
+        for path in glob.glob(os.path.join(directory, '*.npy'))
+    }
+    return AggregateCube(arrays, labels)
+
+
+def load_cube(dataset=None, household_path=SINGLE_HOUSEHOLD_FILE):
+    """원본이 바뀌지 않았다면 저장된 큐브를 열고, 아니면 새로 만들어 저장한다."""
+    if dataset is None:
+        dataset = load_dataset(household_path=household_path)
+    key = _source_key(dataset.districts, household_path)
+    if key not in _cube_memo:
+        directory = os.path.join(CUBE_DIR, key)
+        if not os.path.exists(os.path.join(directory, 'labels.json')):
+            arrays, labels = build_cube_arrays(dataset, household_path)
+            # 이전 원본으로 만든 큐브는 지웁니다.
+            for stale in glob.glob(os.path.join(CUBE_DIR, '*')):
+                shutil.rmtree(stale, ignore_errors=True)
+            save_cube(arrays, labels, directory)
+        _cube_memo[key] = open_cube(directory)
+    return _cube_memo[key]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="집계 큐브 생성 / 자치구별 전년 대비 증감률 출력")
+    parser.add_argument('--waste-type', default='SUM', choices=WASTE_TYPES)
+    parser.add_argument('--rebuild', action='store_true', help='저장된 큐브를 지우고 다시 만듭니다.')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        shutil.rmtree(CUBE_DIR, ignore_errors=True)
+    cube = load_cube()
+    shapes = ', '.join(f"{name}{tuple(array.shape)}" for name, array in cube.arrays.items())
+    print(f"큐브: {shapes} ({CUBE_DIR})")
+    print(cube.yoy(args.waste_type).to_markdown(index=False, numalign="left", stralign="left", floatfmt=",.2f"))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,340 @@
+# 대시보드 서버 : 추세 / 계절성 / 1인 가구 / 구성 분석 결과를 JSON 과 PNG 로 제공하는 asyncio HTTP 서비스
+#
+# 사용 예) python dashboard.py --port 8050
+#   GET /                                                   분석 / 자치구 / 년도 범위 목록
+#   GET /api/trend?district=종로구&from=2020&to=2024          JSON
+#   GET /chart/seasonality.png?district=종로구&from=2019&to=2021 PNG
+#   GET /chart/composition.png?district=종로구&year=2019       (구성은 한 해 단위)
+#
+# - 시작할 때 정규 데이터셋을 한 번 만들어 공유 메모리 맵으로 저장하고, 워커 프로세스는 여기에 붙습니다.
+# - 응답 본문은 (형식, 분석, 자치구, 시작 년도, 끝 년도) 키의 LRU 캐시에 저장해 같은 요청은 바로 돌려줍니다.
+# - 캐시에 없으면 이벤트 루프를 막지 않도록 프로세스 풀에서 계산 / 렌더링하며, 같은 키를 동시에 요청하면 한 번만 계산합니다.
+
+import argparse
+import asyncio
+import io
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from data_loader import DEFAULT_DISTRICT
+
+HOST = '127.0.0.1'
+PORT = 8050
+CACHE_SIZE = 256
+DPI = 100
+
+# 분석 이름 → 차트 스크립트
+ANALYSES = {
+    'trend': 'basic_plot1',
+    'seasonality': 'basic_plot2',
+    'household': 'basic_plot3',
+    'composition': 'alpa_plot3',
+}
+# 한 해 단위로만 계산하는 분석
+SINGLE_YEAR = {'composition'}
+
+CONTENT_TYPES = {'json': 'application/json; charset=utf-8', 'png': 'image/png'}
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """HTTP 상태 코드와 함께 클라이언트에 돌려줄 오류."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------------------------------------
+# 1. 분석 계산 (워커 프로세스)
+# -------------------------------------------------------------
+
+def _in_years(frame, start, end):
+    return frame[frame['년도'].between(start, end)].reset_index(drop=True)
+
+
+def load_analysis(analysis, district, start, end):
+    """분석 하나의 데이터를 차트 스크립트의 plot() 이 받는 형태로 만든다."""
+    import importlib
+    module = importlib.import_module(ANALYSES[analysis])
+    if analysis == 'seasonality':
+        return module.load_data(district, years=(start, end))
+    if analysis == 'composition':
+        return module.load_data(district, end)
+    return _in_years(module.load_data(district), start, end)
+
+
+def _records(frame):
+    # NaN 은 JSON 의 null 로 바꿉니다.
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def to_json(analysis, data):
+    """분석 데이터를 JSON 으로 보낼 수 있는 dict / list 로 바꾼다."""
+    if analysis == 'seasonality':
+        monthly_avg_df, monthly_data = data
+        return {
+            'monthly_mean': _records(monthly_avg_df.assign(월_이름=monthly_avg_df['월_이름'].astype(str))),
+            'monthly_values': [np.asarray(values, dtype='float64').tolist() for values in monthly_data],
+        }
+    if analysis == 'composition':
+        from composition import COMPONENTS
+        return dict(zip(COMPONENTS, (float(v) for v in data)))
+    return _records(data)
+
+
+def compute(kind, analysis, district, start, end):
+    """워커에서 실행: 응답 본문(bytes)을 만든다. kind 는 'json' / 'png'."""
+    data = load_analysis(analysis, district, start, end)
+    if kind == 'json':
+        body = {'analysis': analysis, 'district': district, 'from': start, 'to': end, 'data': to_json(analysis, data)}
+        return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+    import importlib
+    import matplotlib.pyplot as plt
+    from figure_cache import figure_key, cached_path, store_bytes
+
+    # 입력이 같은 그림은 서버를 다시 시작해도 그림 캐시에서 가져옵니다.
+    chart = ANALYSES[analysis]
+    key = figure_key(chart, data, 'png', DPI, extra=[district, start, end])
+    cached = cached_path(key, 'png')
+    if cached is not None:
+        with open(cached, 'rb') as f:
+            return f.read()
+
+    module = importlib.import_module(chart)
+    fig = module.plot(data, district, end) if analysis in SINGLE_YEAR else module.plot(data, district)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=DPI, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    store_bytes(key, 'png', buffer.getvalue())
+    return buffer.getvalue()
+
+
+def _init_worker(shared_dir):
+    from render import _init_worker as init_render_worker
+    init_render_worker(shared_dir)
+
+
+# -------------------------------------------------------------
+# 2. LRU 캐시
+# -------------------------------------------------------------
+
+class LRUCache:
+    """최근에 쓴 순서로 maxsize 개까지 보관하는 dict."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+# -------------------------------------------------------------
+# 3. HTTP 서버
+# -------------------------------------------------------------
+
+class Dashboard:
+    """요청 해석 → 캐시 조회 → (없으면) 워커 풀 계산."""
+
+    def __init__(self, workers=None, cache_size=CACHE_SIZE):
+        from dataset import load_dataset
+        from household import load_household_index
+        from shared_dataset import publish
+
+        # 시작할 때 한 번: 데이터셋을 만들고 워커가 붙을 공유 파일로 저장합니다.
+        dataset = load_dataset()
+        self.districts = list(dataset.districts)
+        waste_years = dataset.waste['날짜'].dropna().dt.year
+        household_years = load_household_index().years
+        self.years = (min(int(waste_years.min()), household_years[0]), max(int(waste_years.max()), household_years[-1]))
+
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(publish(),))
+        self.cache = LRUCache(cache_size)
+        self.pending = {}  # 계산 중인 키 → Future (같은 요청 중복 계산 방지)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    # --- 요청 해석 ---
+
+    def _year(self, query, name, default):
+        value = query.get(name, [None])[0]
+        if value is None:
+            return default
+        try:
+            year = int(value)
+        except ValueError:
+            raise RequestError(400, f"'{name}' 는 년도(정수)여야 합니다: {value}") from None
+        if not self.years[0] <= year <= self.years[1]:
+            raise RequestError(400, f"'{name}' 는 {self.years[0]}~{self.years[1]} 사이여야 합니다: {year}")
+        return year
+
+    def resolve(self, kind, analysis, query):
+        """캐시 키 (형식, 분석, 자치구, 시작 년도, 끝 년도)."""
+        if analysis not in ANALYSES:
+            raise RequestError(404, f"알 수 없는 분석입니다: {analysis} (사용 가능: {', '.join(ANALYSES)})")
+        district = query.get('district', [DEFAULT_DISTRICT])[0]
+        if district not in self.districts:
+            raise RequestError(404, f"'{district}' 데이터가 없습니다. (사용 가능: {', '.join(self.districts)})")
+        if analysis in SINGLE_YEAR:
+            year = self._year(query, 'year', None)
+            if year is None:
+                raise RequestError(400, f"'{analysis}' 는 year 를 지정해야 합니다.")
+            return kind, analysis, district, year, year
+        start = self._year(query, 'from', self.years[0])
+        end = self._year(query, 'to', self.years[1])
+        if start > end:
+            raise RequestError(400, f"from({start}) 이 to({end}) 보다 큽니다.")
+        return kind, analysis, district, start, end
+
+    def route(self, path, query):
+        """경로 → ('index', None) 또는 ('result', 캐시 키)."""
+        parts = [p for p in path.split('/') if p]
+        if not parts:
+            return 'index', None
+        if len(parts) == 2 and parts[0] == 'api':
+            return 'result', self.resolve('json', parts[1], query)
+        if len(parts) == 2 and parts[0] == 'chart' and parts[1].endswith('.png'):
+            return 'result', self.resolve('png', parts[1][:-len('.png')], query)
+        raise RequestError(404, f"없는 경로입니다: {path}")
+
+    def index(self):
+        body = {
+            'analyses': list(ANALYSES),
+            'districts': self.districts,
+            'years': list(self.years),
+            'cache': {'size': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+        return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+    # --- 결과 조회 ---
+
+    async def result(self, key):
+        """(본문, 캐시 적중 여부). 없으면 워커 풀에서 계산하고, 계산 중인 같은 키는 그 결과를 기다린다."""
+        body = self.cache.get(key)
+        if body is not None:
+            return body, True
+        if key not in self.pending:
+            loop = asyncio.get_running_loop()
+            self.pending[key] = loop.run_in_executor(self.pool, compute, *key)
+        future = self.pending[key]
+        try:
+            body = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.pending.pop(key, None)
+        self.cache.put(key, body)
+        return body, False
+
+    # --- 연결 처리 ---
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, request_line.decode('latin-1').split(), keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, request, keep_alive):
+        start = time.perf_counter()
+        status, content_type, cache_state = 200, CONTENT_TYPES['json'], 'miss'
+        try:
+            if len(request) < 2:
+                raise RequestError(400, "잘못된 요청입니다.")
+            if request[0] != 'GET':
+                raise RequestError(405, f"GET 만 지원합니다: {request[0]}")
+            url = urlsplit(request[1])
+            kind, key = self.route(url.path, parse_qs(url.query))
+            if kind == 'index':
+                body = self.index()
+            else:
+                body, hit = await self.result(key)
+                content_type = CONTENT_TYPES[key[0]]
+                cache_state = 'hit' if hit else 'miss'
+        except RequestError as e:
+            status, body = e.status, json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+        except KeyError as e:
+            # 분석 함수가 '데이터 없음'을 KeyError 로 알립니다.
+            status, body = 404, json.dumps({'error': e.args[0]}, ensure_ascii=False).encode('utf-8')
+        except Exception as e:
+            status, body = 500, json.dumps({'error': f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode('utf-8')
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Cache: {cache_state}\r\n"
+            f"Server-Timing: app;dur={elapsed_ms:.3f}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host=HOST, port=PORT, workers=None, cache_size=CACHE_SIZE):
+    dashboard = Dashboard(workers, cache_size)
+    server = await asyncio.start_server(dashboard.handle, host, port)
+    print(f"대시보드: http://{host}:{port}/  (자치구 {len(dashboard.districts)}개, "
+          f"년도 {dashboard.years[0]}~{dashboard.years[1]}, 캐시 {cache_size}개)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        dashboard.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분석 결과(JSON / PNG)를 제공하는 대시보드 서버")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='LRU 캐시에 보관할 응답 수')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
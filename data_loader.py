@@ -0,0 +1,247 @@
+# 공통 데이터 로더 : 원본 파일을 한 번만 파싱하고 결과를 컬럼형 캐시에 저장
+
+import hashlib
+import os
+import glob
+import warnings
+
+import pandas as pd
+
+from periods import parse_periods
+from profiling import span
+
+try:
+    import pyarrow  # noqa: F401  Parquet 캐시에 사용 (없으면 pickle 로 대체)
+    CACHE_EXT = 'parquet'
+except ImportError:
+    CACHE_EXT = 'pkl'
+
+DATA_DIR = "./data"
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+
+# 파싱 로직이 바뀌면 이 값을 올려서 기존 캐시를 무효화합니다.
+CACHE_VERSION = 3
+
+DEFAULT_DISTRICT = '종로구'
+
+# 쓰레기 파일은 자치구별로 따로 제공됩니다.
+WASTE_MONTHLY_TEMPLATE = "./data/서울특별시 {district}_생활쓰레기 월별 발생량.csv"
+FOOD_RECYCLED_TEMPLATE = "./data/서울특별시 {district}_음식물류폐기물 및 재활용품 발생량.csv"
+ANNUAL_AVERAGE_TEMPLATE = "./data/서울특별시 {district}_년_평균_생활쓰레기_발생량.csv"
+
+WASTE_MONTHLY_FILE = WASTE_MONTHLY_TEMPLATE.format(district=DEFAULT_DISTRICT)
+SINGLE_HOUSEHOLD_FILE = "./data/1인가구(연령별)_종로구.csv"
+FOOD_RECYCLED_FILE = FOOD_RECYCLED_TEMPLATE.format(district=DEFAULT_DISTRICT)
+ANNUAL_AVERAGE_FILE = ANNUAL_AVERAGE_TEMPLATE.format(district=DEFAULT_DISTRICT)
+
+TIME_COLUMN = 'Year and month'
+# 발생량(톤)은 float32 로 저장합니다. (유효숫자 7자리면 충분)
+TONNAGE_DTYPE = 'float32'
+WASTE_VALUE_COLUMNS = ['SUM', 'Reclaimed sheep', 'The amount of incineration']
+FOOD_RECYCLED_COLUMNS = ['Month_Year', 'Food_Waste', 'Recycled_Waste']
+ANNUAL_AVERAGE_COLUMNS = ['Year', 'Average_waste_total']
+HOUSEHOLD_HEADER_ROWS = 3
+
+# 같은 프로세스 안에서 반복 호출될 때는 디스크 캐시도 다시 읽지 않습니다.
+_memo = {}
+
+
+# -------------------------------------------------------------
+# 1. 캐시 키 및 저장소
+# -------------------------------------------------------------
+
+def cache_key(path):
+    """파일 경로, 수정 시각, 내용 해시로 캐시 키를 만든다."""
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+    raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{content_hash}|{CACHE_VERSION}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def _write_cache(df, cache_path):
+    # Parquet 은 문자열 컬럼명만 허용하므로 위치 기반(정수) 컬럼명은 문자열로 저장합니다.
+    out = df.copy()
+    out.columns = [str(c) for c in out.columns]
+    if CACHE_EXT == 'parquet':
+        out.to_parquet(cache_path, index=False)
+    else:
+        out.to_pickle(cache_path)
+
+
+def _read_cache(cache_path, integer_columns):
+    if CACHE_EXT == 'parquet':
+        df = pd.read_parquet(cache_path)
+    else:
+        df = pd.read_pickle(cache_path)
+    if integer_columns:
+        df.columns = [int(c) for c in df.columns]
+    return df
+
+
+def load_cached(path, name, parser, integer_columns=False):
+    """path 를 parser 로 한 번만 파싱하고, 이후에는 캐시된 결과를 돌려준다."""
+    key = cache_key(path)
+    # 같은 원본에서 서로 다른 표(name)를 만들 수 있으므로 메모는 (name, 키) 로 구분합니다.
+    if (name, key) in _memo:
+        return _memo[(name, key)].copy()
+
+    # 자치구별 파일이 서로의 캐시를 지우지 않도록 경로 해시를 접두어로 사용합니다.
+    path_id = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    cache_path = os.path.join(CACHE_DIR, f"{name}-{path_id}-{key}.{CACHE_EXT}")
+    if os.path.exists(cache_path):
+        with span(f"cache_read:{name}", 'io'):
+            df = _read_cache(cache_path, integer_columns)
+    else:
+        with span(f"parse:{name}", 'load'):
+            df = parser(path)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # 원본이 바뀌어 더 이상 쓰이지 않는 이전 캐시는 정리합니다.
+        for stale in glob.glob(os.path.join(CACHE_DIR, f"{name}-{path_id}-*.{CACHE_EXT}")):
+            os.remove(stale)
+        with span(f"cache_write:{name}", 'io'):
+            _write_cache(df, cache_path)
+
+    _memo[(name, key)] = df
+    return df.copy()
+
+
+# -------------------------------------------------------------
+# 2. 원본별 파서
+# -------------------------------------------------------------
+
+# 확장자와 상관없이 파일 앞부분(매직 바이트)으로 실제 형식을 판별합니다.
+MAGIC_BYTES = {
+    b'PK\x03\x04': 'xlsx',                     # Excel 2007+ (zip)
+    b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1': 'xls',   # Excel 97-2003
+}
+
+
+def sniff_format(path):
+    """'xlsx' / 'xls' / 'csv' 중 실제 파일 형식."""
+    with open(path, 'rb') as f:
+        head = f.read(8)
+    for magic, file_format in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return file_format
+    return 'csv'
+
+
+def read_xlsx_columns(path, n_columns, skip_rows=1, sheet=None):
+    """XLSX 의 한 시트에서 앞쪽 n_columns 개 컬럼만 스트리밍으로 읽어 행 목록으로 돌려준다."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError(f"{os.path.basename(path)} 은(는) XLSX 파일입니다. openpyxl 을 설치해 주세요.") from None
+
+    # 파일 객체로 열어야 확장자(.csv) 검사를 건너뜁니다. read_only 모드는 필요한 행만 읽습니다.
+    with open(path, 'rb') as f:
+        workbook = load_workbook(f, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            rows = [
+                row for row in worksheet.iter_rows(min_row=skip_rows + 1, max_col=n_columns, values_only=True)
+                if any(value is not None for value in row)
+            ]
+        finally:
+            workbook.close()
+    return rows
+
+
+def _parse_waste_monthly(path):
+    with span('read_csv', 'io'):
+        df = pd.read_csv(path, encoding='utf-8')
+    for column in WASTE_VALUE_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(TONNAGE_DTYPE)
+    # '19-Jan' 형태를 샘플로 판별해 Period[M] 으로 변환 (실패 행은 NaT 로 남김)
+    df['날짜'], _ = parse_periods(df[TIME_COLUMN])
+    return df
+
+
+def _parse_household_raw(path):
+    # 3행 헤더(년도 / 합계 / 연령대)를 그대로 보존하기 위해 헤더 없이 문자열로 읽습니다.
+    with span('read_csv', 'io'):
+        return pd.read_csv(path, encoding='utf-8-sig', header=None, dtype=str)
+
+
+def _parse_food_recycled(path):
+    # 파일에 헤더 행이 없으므로 컬럼명을 직접 지정합니다.
+    with span('read_csv', 'io'):
+        df = pd.read_csv(path, encoding='utf-8', header=None, names=FOOD_RECYCLED_COLUMNS)
+
+    # 헤더 행이 있는 파일이면 첫 행이 숫자가 아니므로 건너뜁니다.
+    if len(df) and pd.isna(pd.to_numeric(df['Food_Waste'].iloc[0], errors='coerce')):
+        df = df.iloc[1:].reset_index(drop=True)
+
+    df['Food_Waste'] = pd.to_numeric(df['Food_Waste'], errors='coerce').astype(TONNAGE_DTYPE)
+    df['Recycled_Waste'] = pd.to_numeric(df['Recycled_Waste'], errors='coerce').astype(TONNAGE_DTYPE)
+    df['Date'], _ = parse_periods(df['Month_Year'])
+    return df
+
+
+def _parse_annual_average(path):
+    # 확장자는 .csv 이지만 실제로는 XLSX 인 경우가 있어 형식을 먼저 확인합니다.
+    file_format = sniff_format(path)
+    if file_format == 'xlsx':
+        df = pd.DataFrame(read_xlsx_columns(path, len(ANNUAL_AVERAGE_COLUMNS)), columns=ANNUAL_AVERAGE_COLUMNS)
+    elif file_format == 'csv':
+        df = pd.read_csv(path, encoding='utf-8-sig', usecols=[0, 1])
+        df.columns = ANNUAL_AVERAGE_COLUMNS
+    else:
+        raise ValueError(f"{os.path.basename(path)}: 지원하지 않는 파일 형식입니다 ({file_format}).")
+
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
+    df['Average_waste_total'] = pd.to_numeric(df['Average_waste_total'], errors='coerce').astype(TONNAGE_DTYPE)
+    return df
+
+
+def _report_rejected(df, column, path):
+    # 날짜 변환에 실패한 행은 버리지 않고 NaT 로 남겨 두고, 개수를 알립니다.
+    rejected = int(df[column].isna().sum())
+    if rejected:
+        warnings.warn(f"{os.path.basename(path)}: 년월 변환 실패 {rejected}행 ('{column}' = NaT)", stacklevel=3)
+    return df
+
+
+# -------------------------------------------------------------
+# 3. 공개 로더
+# -------------------------------------------------------------
+
+def waste_monthly_file(district=DEFAULT_DISTRICT):
+    return WASTE_MONTHLY_TEMPLATE.format(district=district)
+
+
+def food_recycled_file(district=DEFAULT_DISTRICT):
+    return FOOD_RECYCLED_TEMPLATE.format(district=district)
+
+
+def annual_average_file(district=DEFAULT_DISTRICT):
+    return ANNUAL_AVERAGE_TEMPLATE.format(district=district)
+
+
+def load_waste_monthly(path=WASTE_MONTHLY_FILE):
+    """월별 생활쓰레기 발생량 (SUM / 매립 / 소각, '날짜' Period[M] 컬럼 포함)."""
+    return _report_rejected(load_cached(path, 'waste_monthly', _parse_waste_monthly), '날짜', path)
+
+
+def load_household_raw(path=SINGLE_HOUSEHOLD_FILE):
+    """1인 가구 CSV 원본 (헤더 3행 포함, 위치 기반 정수 컬럼)."""
+    return load_cached(path, 'household_raw', _parse_household_raw, integer_columns=True)
+
+
+def load_household(path=SINGLE_HOUSEHOLD_FILE):
+    """3번째 헤더 행을 컬럼명으로 쓰는 1인 가구 데이터 행."""
+    df_raw = load_household_raw(path)
+    df_data = df_raw.iloc[HOUSEHOLD_HEADER_ROWS:].copy()
+    df_data.columns = df_raw.iloc[HOUSEHOLD_HEADER_ROWS - 1]
+    return df_data
+
+
+def load_food_recycled(path=FOOD_RECYCLED_FILE):
+    """월별 음식물 / 재활용 쓰레기 발생량 ('Date' Period[M] 컬럼 포함)."""
+    return _report_rejected(load_cached(path, 'food_recycled', _parse_food_recycled), 'Date', path)
+
+
+def load_annual_average(path=ANNUAL_AVERAGE_FILE):
+    """년도별 평균 생활쓰레기 발생량 (XLSX / CSV 자동 판별)."""
+    return load_cached(path, 'annual_average', _parse_annual_average)
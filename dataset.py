@@ -0,0 +1,117 @@
+# 정규 데이터셋 : 1인 가구 / 쓰레기 표를 숫자 배열과 범주 코드로 한 번만 만들어 공유
+#
+# - 가구 수는 int32, 발생량(톤)은 float32
+# - 자치구 / 성별 / 연령대 / 쓰레기 종류는 범주형(category) 코드
+# 이후 스크립트는 문자열 셀을 다시 숫자로 변환하지 않고 이 표를 그대로 사용합니다.
+
+import os
+
+import pandas as pd
+
+from data_loader import (
+    load_waste_monthly, load_food_recycled, load_household_raw, waste_monthly_file, food_recycled_file,
+    SINGLE_HOUSEHOLD_FILE, WASTE_VALUE_COLUMNS, cache_key,
+)
+from household import load_household_index, household_long
+from profiling import traced
+from validation import validate_tables
+
+# 원본 파일들의 캐시 키 → WasteDataset
+_dataset_memo = {}
+
+
+class WasteDataset:
+    """모든 자치구의 1인 가구 / 월별 생활쓰레기 / 음식물·재활용 표를 담는 정규 데이터셋."""
+
+    def __init__(self, household, waste, food_recycled, districts, validation=None):
+        self.household = household          # 자치구, 성별, 년도(int16), 연령대, 1인가구수(int32)
+        self.waste = waste                  # 자치구, 날짜(Period[M]), SUM / 매립 / 소각 (float32)
+        self.food_recycled = food_recycled  # 자치구, Date(Period[M]), Food_Waste / Recycled_Waste (float32)
+        self.districts = districts
+        self.validation = validation        # 읽을 때 한 번 수행한 품질 검사 결과 (ValidationReport)
+
+    def _check_district(self, district):
+        if district not in self.districts:
+            raise KeyError(f"'{district}' 데이터가 데이터셋에 없습니다. (사용 가능: {', '.join(self.districts)})")
+
+    def waste_for(self, district):
+        """한 자치구의 월별 생활쓰레기 표."""
+        self._check_district(district)
+        return self.waste[self.waste['자치구'] == district].reset_index(drop=True)
+
+    def food_recycled_for(self, district):
+        """한 자치구의 월별 음식물 / 재활용 표."""
+        self._check_district(district)
+        return self.food_recycled[self.food_recycled['자치구'] == district].reset_index(drop=True)
+
+    def memory_usage(self):
+        """표별 메모리 사용량 (바이트)."""
+        return {
+            name: int(getattr(self, name).memory_usage(deep=True).sum())
+            for name in ('household', 'waste', 'food_recycled')
+        }
+
+
+def available_districts(household_path=SINGLE_HOUSEHOLD_FILE):
+    """1인 가구 파일에 있으면서 월별 쓰레기 파일도 있는 자치구 목록."""
+    index = load_household_index(household_path)
+    return [d for d in index.districts if os.path.exists(waste_monthly_file(d))]
+
+
+def _stack_districts(frames, districts, columns):
+    # 자치구별 표를 이어 붙이고 자치구 컬럼을 전체 목록 기준 범주형으로 맞춥니다.
+    if not frames:
+        return pd.DataFrame(columns=columns + ['자치구'])
+    stacked = pd.concat(frames, ignore_index=True)
+    stacked['자치구'] = pd.Categorical(stacked['자치구'], categories=districts)
+    return stacked
+
+
+@traced('load')
+def build_dataset(districts=None, household_path=SINGLE_HOUSEHOLD_FILE,
+                  waste_file=waste_monthly_file, food_file=food_recycled_file):
+    """원본(캐시)에서 정규 데이터셋을 만든다. waste_file / food_file 은 자치구 → 파일 경로 함수."""
+    if districts is None:
+        districts = available_districts(household_path)
+
+    index = load_household_index(household_path)
+    household = household_long(index)
+    household = household[household['자치구'].isin(districts)].reset_index(drop=True)
+    household['자치구'] = household['자치구'].cat.set_categories(districts)
+
+    waste_columns = ['날짜'] + WASTE_VALUE_COLUMNS
+    food_columns = ['Date', 'Food_Waste', 'Recycled_Waste']
+    waste_frames, food_frames = [], []
+    for district in districts:
+        waste = load_waste_monthly(waste_file(district))
+        waste_frames.append(waste[waste_columns].assign(자치구=district))
+        if os.path.exists(food_file(district)):
+            food = load_food_recycled(food_file(district))
+            food_frames.append(food[food_columns].assign(자치구=district))
+
+    waste = _stack_districts(waste_frames, districts, waste_columns)
+    food_recycled = _stack_districts(food_frames, districts, food_columns)
+    # 품질 검사는 여기서 한 번만 수행하고 결과를 데이터셋과 함께 공유합니다.
+    validation = validate_tables(index, load_household_raw(household_path), waste, food_recycled)
+    return WasteDataset(household, waste, food_recycled, list(districts), validation)
+
+
+def source_paths(districts, household_path=SINGLE_HOUSEHOLD_FILE):
+    """데이터셋을 만드는 원본 파일 경로 목록."""
+    return [household_path] + [waste_monthly_file(d) for d in districts] + \
+        [food_recycled_file(d) for d in districts if os.path.exists(food_recycled_file(d))]
+
+
+def dataset_key(districts, household_path=SINGLE_HOUSEHOLD_FILE):
+    """원본 파일들의 캐시 키 묶음 (load_dataset 메모 키)."""
+    return tuple(cache_key(p) for p in source_paths(districts, household_path))
+
+
+def load_dataset(districts=None, household_path=SINGLE_HOUSEHOLD_FILE):
+    """원본이 바뀌지 않았다면 프로세스 안에서 한 번 만든 데이터셋을 재사용한다."""
+    if districts is None:
+        districts = available_districts(household_path)
+    key = dataset_key(districts, household_path)
+    if key not in _dataset_memo:
+        _dataset_memo[key] = build_dataset(districts, household_path)
+    return _dataset_memo[key]
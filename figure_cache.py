@@ -0,0 +1,132 @@
+# 그림 캐시 : 차트 입력 데이터 / 스타일 설정 / 라이브러리 버전 / 차트 코드를 해시해 저장한 PNG·SVG 를 재사용
+#
+# 키가 같으면 plot() 과 savefig() 를 건너뛰고 저장된 파일을 복사합니다.
+# 월별 데이터가 바뀐 자치구의 차트만 다시 그려집니다.
+
+import glob
+import hashlib
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CACHE_DIR
+
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, "figures")
+# 저장 개수가 넘으면 가장 오래 쓰지 않은 그림부터 지웁니다.
+FIGURE_CACHE_LIMIT = 2000
+
+# 그림 모양에 영향을 주는 공통 모듈 (차트 스크립트 자신은 키에 따로 포함)
+STYLE_MODULES = ['plot_style', 'annotate']
+
+_code_digests = {}
+
+
+# -------------------------------------------------------------
+# 1. 키 계산
+# -------------------------------------------------------------
+
+def _update(digest, obj):
+    # 같은 값이면 프로세스 / 실행이 달라도 같은 바이트를 넣습니다.
+    if isinstance(obj, pd.DataFrame):
+        digest.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        digest.update(repr((obj.name, str(obj.dtype))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.shape, str(obj.dtype))).encode('utf-8'))
+        digest.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else pickle.dumps(obj.tolist()))
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"{type(obj).__name__}:{len(obj)}".encode('utf-8'))
+        for item in obj:
+            _update(digest, item)
+    elif isinstance(obj, dict):
+        for name in sorted(obj, key=repr):
+            _update(digest, name)
+            _update(digest, obj[name])
+    elif obj is None or isinstance(obj, (str, int, float, bool, np.generic)):
+        digest.update(f"{type(obj).__name__}:{obj!r}".encode('utf-8'))
+    else:
+        digest.update(pickle.dumps(obj))
+
+
+def data_digest(obj):
+    """차트 입력 데이터(DataFrame / 배열 / 목록 / 숫자)의 내용 해시."""
+    digest = hashlib.sha256()
+    _update(digest, obj)
+    return digest.hexdigest()
+
+
+def code_digest(module_name):
+    """모듈 소스 파일 내용의 해시 (프로세스 안에서 한 번만 읽음)."""
+    if module_name not in _code_digests:
+        import importlib
+        path = importlib.import_module(module_name).__file__
+        with open(path, 'rb') as f:
+            _code_digests[module_name] = hashlib.sha256(f.read()).hexdigest()
+    return _code_digests[module_name]
+
+
+def figure_key(chart, data, fmt, dpi, extra=()):
+    """(차트 코드, 입력 데이터, 형식, dpi, 한글 폰트, matplotlib 버전, 기타 인자) 해시."""
+    import matplotlib
+    from plot_style import resolve_korean_font
+
+    parts = [
+        chart, code_digest(chart), *(code_digest(m) for m in STYLE_MODULES),
+        data_digest(data), fmt, str(dpi), str(resolve_korean_font()),
+        matplotlib.__version__, data_digest(list(extra)),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+
+# -------------------------------------------------------------
+# 2. 저장 / 조회
+# -------------------------------------------------------------
+
+def cached_path(key, fmt):
+    """저장된 그림 경로 (없으면 None). 찾으면 사용 시각을 갱신한다."""
+    path = os.path.join(FIGURE_CACHE_DIR, f"{key}.{fmt}")
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+
+def _write(key, fmt, write):
+    # 임시 파일에 쓴 뒤 이름을 바꿔 반쯤 쓴 파일이 보이지 않게 합니다.
+    os.makedirs(FIGURE_CACHE_DIR, exist_ok=True)
+    path = os.path.join(FIGURE_CACHE_DIR, f"{key}.{fmt}")
+    temp = f"{path}.{os.getpid()}.tmp"
+    write(temp)
+    os.replace(temp, path)
+    _prune()
+    return path
+
+
+def store(key, fmt, source_path):
+    """그린 파일을 캐시에 복사한다."""
+    return _write(key, fmt, lambda temp: shutil.copyfile(source_path, temp))
+
+
+def store_bytes(key, fmt, content):
+    """메모리에서 그린 그림(bytes)을 캐시에 저장한다."""
+    def write(temp):
+        with open(temp, 'wb') as f:
+            f.write(content)
+    return _write(key, fmt, write)
+
+
+def _prune(limit=FIGURE_CACHE_LIMIT):
+    paths = [p for p in glob.glob(os.path.join(FIGURE_CACHE_DIR, '*')) if not p.endswith('.tmp')]
+    if len(paths) <= limit:
+        return
+    paths.sort(key=lambda p: os.stat(p).st_mtime)
+    for path in paths[:len(paths) - limit]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # 다른 워커가 먼저 지운 경우
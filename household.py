@@ -0,0 +1,128 @@
+# 1인 가구 데이터 변환 : 년도별 16컬럼 넓은 표를 (자치구, 성별, 년도, 연령대) 긴 표로 변환
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_household_raw, cache_key, HOUSEHOLD_HEADER_ROWS, SINGLE_HOUSEHOLD_FILE
+from profiling import span, traced
+
+# 원본 앞쪽 3개 컬럼: 자치구별(1), 자치구별(2), 성별(1)
+ID_COLUMN_COUNT = 3
+DISTRICT_POSITION = 1
+SEX_POSITION = 2
+
+TOTAL_SEX = '계'
+TOTAL_GROUP = '합계'
+TOTAL_BAND = '소계'
+BANDS_20_30S = ['20~24세', '25~29세', '30~34세', '35~39세']
+
+COUNT_COLUMN = '1인가구수'
+
+# 파일별로 한 번만 만든 색인을 재사용합니다. (캐시 키 → HouseholdIndex)
+_index_memo = {}
+
+
+# -------------------------------------------------------------
+# 1. 헤더 기반 컬럼 색인
+# -------------------------------------------------------------
+
+class HouseholdIndex:
+    """헤더 3행(년도 → 합계 → 연령대)으로 만든 (년도, 연령대) → 컬럼 위치 색인."""
+
+    def __init__(self, df_raw):
+        header = df_raw.iloc[:HOUSEHOLD_HEADER_ROWS, ID_COLUMN_COUNT:]
+        body = df_raw.iloc[HOUSEHOLD_HEADER_ROWS:]
+
+        # 컬럼별 년도 / 그룹 / 연령대 (값 행렬의 컬럼 순서와 같음)
+        self.column_years = pd.to_numeric(header.iloc[0]).to_numpy().astype(np.int16)
+        self.column_groups = header.iloc[1].to_numpy()
+        self.column_bands = header.iloc[2].to_numpy()
+
+        self.columns = {
+            (int(year), group, band): position
+            for position, (year, group, band)
+            in enumerate(zip(self.column_years, self.column_groups, self.column_bands))
+        }
+        self.rows = {
+            (district, sex): position
+            for position, (district, sex)
+            in enumerate(zip(body.iloc[:, DISTRICT_POSITION], body.iloc[:, SEX_POSITION]))
+        }
+        self.row_districts = body.iloc[:, DISTRICT_POSITION].to_numpy()
+        self.row_sexes = body.iloc[:, SEX_POSITION].to_numpy()
+
+        self.years = sorted(set(int(y) for y in self.column_years))
+        self.bands = list(pd.unique(self.column_bands))
+        self.districts = list(pd.unique(self.row_districts))
+
+        # 모든 셀을 한 번에 숫자로 변환한 값 행렬 (행: 자치구·성별, 열: 년도·연령대)
+        values = body.iloc[:, ID_COLUMN_COUNT:].to_numpy().ravel()
+        self.values = (
+            pd.to_numeric(pd.Series(values), errors='coerce')
+            .fillna(0).astype(np.int32).to_numpy()
+            .reshape(len(body), len(self.column_years))
+        )
+
+    def column_positions(self, years, bands, group=TOTAL_GROUP, allow_missing=False):
+        """(년도 × 연령대) 컬럼 위치 행렬. 없는 조합은 KeyError, allow_missing 이면 -1."""
+        if allow_missing:
+            return np.array([[self.columns.get((int(y), group, b), -1) for b in bands] for y in years], dtype=np.intp)
+        try:
+            return np.array([[self.columns[(int(y), group, b)] for b in bands] for y in years], dtype=np.intp)
+        except KeyError as e:
+            raise KeyError(f"1인 가구 파일 헤더에 (년도, 그룹, 연령대) {e.args[0]} 조합이 없습니다.") from None
+
+    def gather(self, district, years, bands, sex=TOTAL_SEX, group=TOTAL_GROUP):
+        """지정한 자치구·성별 행에서 (년도 × 연령대) 값을 한 번의 fancy-index 로 가져온다."""
+        try:
+            row = self.rows[(district, sex)]
+        except KeyError:
+            raise KeyError(f"'{district}' / '{sex}' 데이터가 파일에 없습니다.") from None
+        return self.values[row, self.column_positions(years, bands, group)]
+
+
+def take_columns(values, rows, positions):
+    """values[rows, positions] 를 float64 로 가져온다. 위치가 -1 인 칸(그 년도에 없는 연령대)은 NaN."""
+    taken = values[rows, np.maximum(positions, 0)].astype('float64')
+    return np.where(positions < 0, np.nan, taken)
+
+
+def load_household_index(path=SINGLE_HOUSEHOLD_FILE):
+    """원본이 바뀌지 않았다면 한 번 만든 HouseholdIndex 를 그대로 돌려준다."""
+    key = cache_key(path)
+    if key not in _index_memo:
+        df_raw = load_household_raw(path)
+        with span('household_index', 'transform'):
+            _index_memo[key] = HouseholdIndex(df_raw)
+    return _index_memo[key]
+
+
+def district_annual(index, district, bands=(TOTAL_BAND,), sex=TOTAL_SEX):
+    """한 자치구의 년도별 (지정 연령대 합계) 1인 가구 수."""
+    counts = index.gather(district, index.years, bands, sex=sex).sum(axis=1)
+    return pd.DataFrame({'년도': index.years, COUNT_COLUMN: counts})
+
+
+# -------------------------------------------------------------
+# 2. 긴 표 변환 및 집계
+# -------------------------------------------------------------
+
+@traced('transform')
+def household_long(index=None):
+    """색인의 값 행렬을 모든 자치구·년도에 대해 한 번에 긴 표로 변환한다."""
+    if index is None:
+        index = load_household_index()
+
+    n_rows, n_cols = index.values.shape
+    # 합계 그룹에 속한 컬럼만 사용 (헤더 색인 기준)
+    keep = np.flatnonzero(index.column_groups == TOTAL_GROUP)
+
+    long_df = pd.DataFrame({
+        '자치구': pd.Categorical(np.repeat(index.row_districts, len(keep))),
+        '성별': pd.Categorical(np.repeat(index.row_sexes, len(keep))),
+        '년도': np.tile(index.column_years[keep], n_rows),
+        '연령대': pd.Categorical(np.tile(index.column_bands[keep], n_rows), categories=index.bands),
+        COUNT_COLUMN: index.values[:, keep].ravel(),
+    })
+    return long_df
+
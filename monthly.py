@@ -0,0 +1,94 @@
+# 월 단위 결합 : 년도별 1인 가구 수를 월 단위로 보간해 월별 쓰레기 행과 Period[M] 으로 맞춤
+#
+# 년도별 가구 수는 그 해 ANCHOR_MONTH 월의 값으로 보고, 관측 년도 사이의 월만 보간합니다.
+# (첫 관측 이전 / 마지막 관측 이후 월은 외삽하지 않고 NaN 으로 둡니다.)
+# 보간 결과는 자치구별로 디스크에 캐시되어 같은 원본이면 다시 계산하지 않습니다.
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from data_loader import SINGLE_HOUSEHOLD_FILE, DEFAULT_DISTRICT, load_cached
+from dataset import load_dataset
+from household import load_household_index, district_annual, TOTAL_BAND, TOTAL_SEX, COUNT_COLUMN
+
+# 주민등록 기준 1인 가구 수는 연말(12월) 값입니다.
+ANCHOR_MONTH = 12
+METHODS = ('linear', 'spline')
+
+
+# -------------------------------------------------------------
+# 1. 보간
+# -------------------------------------------------------------
+
+def anchor_periods(years, month=ANCHOR_MONTH):
+    """년도 목록을 기준 월의 Period[M] 으로 바꾼다."""
+    return pd.PeriodIndex([pd.Period(year=int(y), month=month, freq='M') for y in years])
+
+
+def interpolate_annual(years, counts, periods, method='linear'):
+    """년도별 값을 periods(Period[M]) 위치로 보간한 float64 배열. 관측 범위 밖은 NaN."""
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 보간 방법입니다: {method} (가능: {', '.join(METHODS)})")
+    # 월 단위 정수 축(1970-01 부터의 개월 수)에서 보간합니다.
+    x = anchor_periods(years).asi8.astype('float64')
+    y = np.asarray(counts, dtype='float64')
+    t = pd.PeriodIndex(periods, freq='M').asi8.astype('float64')
+    if len(x) < 2:
+        raise ValueError("보간하려면 관측 년도가 2개 이상 필요합니다.")
+
+    if method == 'linear':
+        return np.interp(t, x, y, left=np.nan, right=np.nan)
+    from scipy.interpolate import CubicSpline
+    return CubicSpline(x, y, extrapolate=False)(t)
+
+
+def _build_grid(index, district, bands, sex, method):
+    annual = district_annual(index, district, bands=bands, sex=sex)
+    anchors = anchor_periods(annual['년도'])
+    periods = pd.period_range(anchors[0], anchors[-1], freq='M')
+    values = interpolate_annual(annual['년도'], annual[COUNT_COLUMN], periods, method)
+    # Parquet 캐시에 그대로 넣을 수 있도록 월은 정수 서수로 보관하고, 읽을 때 Period[M] 으로 되돌립니다.
+    return pd.DataFrame({'날짜': periods.asi8, COUNT_COLUMN: values})
+
+
+def monthly_household(district=DEFAULT_DISTRICT, bands=(TOTAL_BAND,), sex=TOTAL_SEX, method='linear',
+                      path=SINGLE_HOUSEHOLD_FILE):
+    """월 단위로 보간한 1인 가구 수 ('날짜' Period[M], 1인가구수 float64). 자치구별로 캐시된다."""
+    bands = tuple(bands)
+    # 연령대 목록은 길어질 수 있어 해시로 줄여 캐시 이름에 넣습니다.
+    bands_id = hashlib.sha1('|'.join(bands).encode('utf-8')).hexdigest()[:8]
+    name = f"monthly_household-{district}-{sex}-{bands_id}-{method}"
+    # 1인 가구 원본의 캐시 키로 저장 / 재사용 / 이전 결과 정리는 load_cached 가 맡습니다.
+    grid = load_cached(path, name, lambda p: _build_grid(load_household_index(p), district, bands, sex, method))
+    grid['날짜'] = pd.PeriodIndex.from_ordinals(grid['날짜'], freq='M')
+    return grid
+
+
+# -------------------------------------------------------------
+# 2. 월별 쓰레기와 결합
+# -------------------------------------------------------------
+
+def join_monthly(district=DEFAULT_DISTRICT, bands=(TOTAL_BAND,), sex=TOTAL_SEX, method='linear', dataset=None):
+    """월별 쓰레기 행에 같은 월의 보간 1인 가구 수를 붙인 표. 보간 범위 밖의 월은 제외한다."""
+    if dataset is None:
+        dataset = load_dataset()
+    waste = dataset.waste_for(district).dropna(subset=['날짜'])
+    household = monthly_household(district, bands, sex, method)
+    joined = waste.merge(household, on='날짜', how='inner')
+    return joined.dropna(subset=[COUNT_COLUMN]).reset_index(drop=True)
+
+
+def monthly_regression(district=DEFAULT_DISTRICT, waste_column='SUM', bands=(TOTAL_BAND,), method='linear',
+                       joined=None):
+    """월 단위 결합 표에서 1인 가구 수 → 쓰레기 발생량 단순 회귀 결과 (correlation.batch_linregress).
+
+    이미 결합한 표(joined)를 주면 다시 결합하지 않습니다.
+    """
+    from correlation import batch_linregress
+
+    if joined is None:
+        joined = join_monthly(district, bands, method=method)
+    result = batch_linregress(joined[COUNT_COLUMN].to_numpy(), joined[waste_column].to_numpy())
+    return {name: value.item() for name, value in result.items()}
@@ -0,0 +1,55 @@
+# 년월 파싱 : 샘플로 날짜 형식(YY-Mon / Mon-YY / ISO)을 판별한 뒤 한 번에 Period[M] 으로 변환
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from profiling import traced
+
+# 형식 이름: (정규식, strftime 형식)
+PERIOD_FORMATS = {
+    'YY-Mon': (re.compile(r'^\d{2}-[A-Za-z]{3}$'), '%y-%b'),      # 19-Jan (월별 생활쓰레기)
+    'Mon-YY': (re.compile(r'^[A-Za-z]{3}-\d{2}$'), '%b-%y'),      # Jan-19
+    'ISO': (re.compile(r'^\d{4}-\d{2}-\d{2}$'), '%Y-%m-%d'),      # 2019-01-01 (음식물/재활용)
+    'YYYY-MM': (re.compile(r'^\d{4}-\d{2}$'), '%Y-%m'),           # 2019-01
+}
+
+SAMPLE_SIZE = 24
+
+
+def detect_period_format(values, sample_size=SAMPLE_SIZE):
+    """앞쪽 샘플에서 가장 많이 맞는 형식 이름을 돌려준다. 맞는 형식이 없으면 ValueError."""
+    sample = [str(v).strip() for v in pd.Series(values).dropna().head(sample_size)]
+    scores = {
+        name: sum(1 for v in sample if pattern.match(v))
+        for name, (pattern, _) in PERIOD_FORMATS.items()
+    }
+    best = max(scores, key=scores.get)
+    if scores[best] == 0:
+        raise ValueError(f"년월 형식을 판별할 수 없습니다. 샘플: {sample[:3]}")
+    return best
+
+
+@traced('transform', 'parse_periods')
+def parse_periods(values, format_name=None):
+    """년월 문자열 컬럼을 Period[M] 으로 변환한다. (변환 결과, 변환 실패 행 수)를 돌려준다.
+
+    값의 종류가 적으므로 고유값만 한 번 파싱한 뒤 코드로 펼칩니다.
+    """
+    values = pd.Series(values)
+    if format_name is None:
+        format_name = detect_period_format(values)
+    _, strftime_format = PERIOD_FORMATS[format_name]
+
+    codes, uniques = pd.factorize(values.astype('string').str.strip())
+    parsed = pd.to_datetime(pd.Index(uniques, dtype=object), format=strftime_format, errors='coerce')
+    lookup = parsed.to_period('M')
+
+    # 결측(-1) 코드는 NaT 로 채웁니다.
+    periods = lookup.take(codes, allow_fill=True, fill_value=pd.NaT) if len(lookup) else \
+        pd.PeriodIndex([pd.NaT] * len(codes), freq='M')
+    periods = pd.Series(periods, index=values.index, name=values.name)
+
+    rejected = int(np.count_nonzero(periods.isna()))
+    return periods, rejected
@@ -0,0 +1,83 @@
+# 공통 그래프 설정 : 한글 폰트를 찾아 결과를 디스크에 저장해 두고 적용
+#
+# matplotlib 은 폰트를 실제로 적용할 때만 불러옵니다. (표만 출력하는 실행은 matplotlib 을 불러오지 않음)
+
+import glob
+import json
+import os
+import sys
+
+from data_loader import CACHE_DIR
+from profiling import span
+
+# 앞에서부터 설치된 폰트를 사용합니다. (Windows / Linux / macOS 순)
+KOREAN_FONT_CANDIDATES = ['Malgun Gothic', 'NanumGothic', 'Noto Sans CJK KR', 'Noto Sans KR', 'AppleGothic']
+
+FONT_CACHE_FILE = os.path.join(CACHE_DIR, "font.json")
+
+# 표만 출력하고 그림은 그리지 않는 실행 (--numbers-only 또는 WASTE_NUMBERS_ONLY=1)
+NUMBERS_ONLY_FLAG = '--numbers-only'
+NUMBERS_ONLY_ENV = 'WASTE_NUMBERS_ONLY'
+
+_resolved_font = None
+
+
+def _font_cache_key():
+    # matplotlib 버전 / 후보 목록 / matplotlib 폰트 목록 캐시 파일이 같으면 결과도 같습니다.
+    import matplotlib
+    fontlists = glob.glob(os.path.join(matplotlib.get_cachedir(), 'fontlist-*.json'))
+    mtime = max((os.stat(p).st_mtime_ns for p in fontlists), default=0)
+    return f"{matplotlib.__version__}|{'/'.join(KOREAN_FONT_CANDIDATES)}|{mtime}"
+
+
+def _read_font_cache(key):
+    try:
+        with open(FONT_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # 폰트 파일이 지워졌다면 다시 찾습니다.
+    if cached.get('key') != key or (cached['font'] and not os.path.exists(cached['path'])):
+        return None
+    return cached['font']
+
+
+def _write_font_cache(key, font, path):
+    os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+    with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'font': font, 'path': path}, f, ensure_ascii=False)
+
+
+def resolve_korean_font():
+    """설치된 한글 폰트 이름 (없으면 None). ttflist 검사 결과는 디스크에 저장해 다음 실행에서 재사용한다."""
+    global _resolved_font
+    if _resolved_font is None:
+        key = _font_cache_key()
+        _resolved_font = _read_font_cache(key)
+        if _resolved_font is None:
+            with span('font_lookup', 'plot'):
+                from matplotlib import font_manager as fm
+                available = {f.name for f in fm.fontManager.ttflist}
+                font = next((name for name in KOREAN_FONT_CANDIDATES if name in available), '')
+                path = fm.findfont(font, fallback_to_default=False) if font else ''
+            _write_font_cache(key, font, path)
+            _resolved_font = font
+    return _resolved_font or None
+
+
+def setup_fonts():
+    """한글 폰트와 마이너스 기호 설정을 rcParams 에 적용한다."""
+    import matplotlib
+
+    font = resolve_korean_font()
+    # 한글 폰트가 없으면 기본 폰트를 유지해 findfont 경고가 반복되지 않게 합니다.
+    if font:
+        matplotlib.rcParams['font.family'] = font
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return font
+
+
+def numbers_only(argv=None):
+    """숫자(표)만 출력하는 실행인지. 이 경우 스크립트는 matplotlib 을 불러오지 않는다."""
+    argv = sys.argv[1:] if argv is None else argv
+    return NUMBERS_ONLY_FLAG in argv or os.environ.get(NUMBERS_ONLY_ENV, '') not in ('', '0')
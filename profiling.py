@@ -0,0 +1,214 @@
+# 단계별 계측 : 로드 / 변환 / 그리기 단계의 소요 시간과 메모리(RSS) 변화를 Chrome trace JSON 으로 기록
+#
+# 환경 변수 WASTE_PROFILE=1 (또는 render.py / wasteanalysis.py 의 --profile) 로 켭니다.
+# 프로세스마다 WASTE_PROFILE_DIR(기본 ./output/profile) 아래 trace-<pid>.json 을 남기며,
+#   python profiling.py merge            → 한 파일로 합쳐 chrome://tracing / Perfetto 에서 열기
+#   python profiling.py diff a.json b.json → 두 실행의 단계별 합계 시간 비교
+# 꺼져 있을 때 span() 은 아무것도 기록하지 않습니다.
+
+import argparse
+import atexit
+import functools
+import glob
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_ENV = 'WASTE_PROFILE'
+PROFILE_DIR_ENV = 'WASTE_PROFILE_DIR'
+PROFILE_DIR = "./output/profile"
+
+_events = []
+_lock = threading.Lock()
+_enabled = os.environ.get(PROFILE_ENV, '') not in ('', '0')
+_registered = False
+
+
+# -------------------------------------------------------------
+# 1. 켜기 / 메모리 측정
+# -------------------------------------------------------------
+
+def enable(directory=None):
+    """현재 프로세스와 이후에 만드는 자식 프로세스에서 계측을 켠다. 이전 실행의 trace 파일은 지운다."""
+    global _enabled
+    os.environ[PROFILE_ENV] = '1'
+    if directory:
+        os.environ[PROFILE_DIR_ENV] = directory
+    for stale in glob.glob(os.path.join(os.environ.get(PROFILE_DIR_ENV, PROFILE_DIR), 'trace-*.json')):
+        os.remove(stale)
+    _enabled = True
+    _register()
+
+
+def enabled():
+    return _enabled
+
+
+def _register():
+    # 정상 종료 시 한 번 기록합니다. (프로세스 풀 워커는 작업마다 flush() 를 호출합니다)
+    global _registered
+    if not _registered:
+        atexit.register(flush)
+        _registered = True
+
+
+def current_rss_kb():
+    """현재 RSS (KB). /proc 가 없는 환경에서는 최대 RSS 로 대신한다."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+# -------------------------------------------------------------
+# 2. 구간(span) 기록
+# -------------------------------------------------------------
+
+@contextmanager
+def span(name, category='stage', **args):
+    """with 블록의 시작 시각 / 소요 시간 / RSS 변화를 Chrome trace 'X' 이벤트로 기록한다."""
+    if not _enabled:
+        yield
+        return
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        rss_after = current_rss_kb()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (time.time() - duration) * 1e6,
+            'dur': duration * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': dict(args, rss_kb=rss_after, rss_delta_kb=rss_after - rss_before),
+        }
+        with _lock:
+            _events.append(event)
+
+
+def traced(category='stage', name=None):
+    """함수 호출 전체를 span 으로 감싸는 데코레이터. 이름은 기본으로 '모듈.함수'."""
+    def decorator(func):
+        module = func.__module__
+        if module == '__main__':
+            # 스크립트로 직접 실행된 경우에도 파일 이름으로 구분합니다.
+            module = os.path.splitext(os.path.basename(getattr(sys.modules['__main__'], '__file__', 'main')))[0]
+        label = name or f"{module}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            if not _enabled:
+                return func(*a, **kw)
+            with span(label, category):
+                return func(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def summarize(events):
+    """이름별 호출 수 / 합계·평균 시간(ms) / RSS 변화 합계(KB). 실행 간 비교용."""
+    summary = {}
+    for event in events:
+        entry = summary.setdefault(event['name'], {'count': 0, 'total_ms': 0.0, 'rss_delta_kb': 0})
+        entry['count'] += 1
+        entry['total_ms'] += event['dur'] / 1000
+        entry['rss_delta_kb'] += event['args'].get('rss_delta_kb', 0)
+    for entry in summary.values():
+        entry['mean_ms'] = entry['total_ms'] / entry['count']
+    return dict(sorted(summary.items()))
+
+
+def _write_trace(path, events):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'summary': summarize(events)},
+                  f, ensure_ascii=False, indent=1)
+
+
+def flush():
+    """지금까지 기록한 이벤트를 이 프로세스의 trace 파일에 쓴다. 기록한 경로 (없으면 None)."""
+    if not _enabled or not _events:
+        return None
+    directory = os.environ.get(PROFILE_DIR_ENV, PROFILE_DIR)
+    path = os.path.join(directory, f"trace-{os.getpid()}.json")
+    with _lock:
+        events = list(_events)
+    _write_trace(path, events)
+    return path
+
+
+if _enabled:
+    _register()
+
+
+# -------------------------------------------------------------
+# 3. 합치기 / 비교
+# -------------------------------------------------------------
+
+def load_events(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['traceEvents']
+
+
+def merge(directory=None, out=None):
+    """프로세스별 trace 파일을 하나로 합친다."""
+    directory = directory or os.environ.get(PROFILE_DIR_ENV, PROFILE_DIR)
+    out = out or os.path.join(directory, 'trace.json')
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, 'trace-*.json'))):
+        events.extend(load_events(path))
+    events.sort(key=lambda e: e['ts'])
+    _write_trace(out, events)
+    return out, len(events)
+
+
+def diff(before_path, after_path):
+    """두 trace 의 이름별 합계 시간(ms) 비교 표 (이름, 이전, 이후, 변화율)."""
+    before = summarize(load_events(before_path))
+    after = summarize(load_events(after_path))
+    rows = []
+    for name in sorted(set(before) | set(after)):
+        b = before.get(name, {}).get('total_ms')
+        a = after.get(name, {}).get('total_ms')
+        change = (a / b - 1) * 100 if a is not None and b else None
+        rows.append((name, b, a, change))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계측 결과(trace) 합치기 / 비교")
+    sub = parser.add_subparsers(dest='command', required=True)
+    merge_parser = sub.add_parser('merge', help='프로세스별 trace 파일을 하나로 합칩니다.')
+    merge_parser.add_argument('--dir', default=None)
+    merge_parser.add_argument('--out', default=None)
+    diff_parser = sub.add_parser('diff', help='두 trace 의 단계별 합계 시간을 비교합니다.')
+    diff_parser.add_argument('before')
+    diff_parser.add_argument('after')
+    args = parser.parse_args(argv)
+
+    if args.command == 'merge':
+        out, count = merge(args.dir, args.out)
+        print(f"이벤트 {count}개 → {out}")
+        return 0
+
+    fmt = lambda v: '-' if v is None else f"{v:,.2f}"  # noqa: E731
+    print(f"{'단계':<50} {'이전(ms)':>12} {'이후(ms)':>12} {'변화(%)':>10}")
+    for name, before, after, change in diff(args.before, args.after):
+        print(f"{name:<50} {fmt(before):>12} {fmt(after):>12} {fmt(change):>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+# 배치 렌더링 : 화면 출력 없이(Agg) 여러 자치구의 차트를 PNG/SVG 파일로 저장
+#
+# 사용 예) python render.py --districts 종로구 중구 --charts basic_plot1 alpa_plot3 --formats png svg
+
+import argparse
+import importlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')  # pyplot 을 불러오기 전에 비대화형 백엔드로 고정합니다.
+import matplotlib.pyplot as plt
+
+from data_loader import DEFAULT_DISTRICT
+from figure_cache import figure_key, cached_path, store
+from plot_style import setup_fonts
+import profiling
+from profiling import span
+
+# 각 스크립트는 load_data(district) / plot(data, district) 를 제공합니다.
+# (total_function.py 는 표만 출력하므로 제외)
+CHARTS = [
+    'basic_plot1',
+    'basic_plot2',
+    'basic_plot3',
+    'basic_plot4',
+    'basic_plot5',
+    'alpa_plot1',
+    'alpha_plot2',
+    'alpa_plot3',
+]
+
+OUTPUT_DIR = "./output"
+DPI = 150
+
+
+def _init_worker(shared_dir=None):
+    # 워커 프로세스마다 폰트는 한 번만 찾고, 공유 데이터셋이 있으면 복사 없이 붙습니다.
+    matplotlib.use('Agg')
+    setup_fonts()
+    if shared_dir:
+        from shared_dataset import attach
+        attach(shared_dir)
+
+
+def render_chart(chart, district, out_dir=OUTPUT_DIR, formats=('png',), dpi=DPI, data=None, use_cache=True):
+    """차트 하나를 그려서 파일로 저장하고 저장된 경로 목록을 돌려준다. data 를 주면 load_data 를 건너뛴다.
+
+    입력 데이터 / 스타일 / 라이브러리 버전이 같은 그림이 그림 캐시에 있으면 그리지 않고 복사한다.
+    """
+    module = importlib.import_module(chart)
+    if data is None:
+        data = module.load_data(district)
+    paths = {fmt: os.path.join(out_dir, f"{district}_{chart}.{fmt}") for fmt in formats}
+    keys = {fmt: figure_key(chart, data, fmt, dpi, extra=[district]) for fmt in formats} if use_cache else {}
+
+    missing = []
+    for fmt in formats:
+        cached = cached_path(keys[fmt], fmt) if use_cache else None
+        if cached is None:
+            missing.append(fmt)
+        else:
+            with span(f"figure_cache_hit:{chart}", 'plot', format=fmt):
+                shutil.copyfile(cached, paths[fmt])
+    if not missing:
+        profiling.flush()
+        return list(paths.values())
+
+    fig = module.plot(data, district)
+    try:
+        for fmt in missing:
+            with span(f"savefig:{chart}", 'plot', format=fmt):
+                fig.savefig(paths[fmt], dpi=dpi, bbox_inches='tight')
+            if use_cache:
+                store(keys[fmt], fmt, paths[fmt])
+        return list(paths.values())
+    finally:
+        plt.close(fig)
+        # 프로세스 풀 워커는 종료 시 atexit 가 실행되지 않으므로 작업마다 기록합니다.
+        profiling.flush()
+
+
+def render_all(districts=(DEFAULT_DISTRICT,), charts=None, formats=('png',), out_dir=OUTPUT_DIR, workers=None,
+               use_cache=True):
+    """(자치구 × 차트) 작업을 프로세스 풀에 나눠 렌더링한다. (성공 경로, 실패 목록)을 돌려준다."""
+    charts = list(charts or CHARTS)
+    unknown = [c for c in charts if c not in CHARTS]
+    if unknown:
+        raise ValueError(f"알 수 없는 차트입니다: {', '.join(unknown)} (사용 가능: {', '.join(CHARTS)})")
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(chart, district) for district in districts for chart in charts]
+
+    saved, failed = [], []
+    if workers == 1:
+        # 디버깅용: 프로세스 풀 없이 현재 프로세스에서 순서대로 실행
+        _init_worker()
+        for chart, district in jobs:
+            try:
+                saved.extend(render_chart(chart, district, out_dir, formats, use_cache=use_cache))
+            except Exception as e:
+                failed.append((chart, district, e))
+        return saved, failed
+
+    # 원본 표는 부모에서 한 번 저장하고 워커는 메모리 맵으로 공유합니다.
+    from shared_dataset import publish
+    shared_dir = publish()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared_dir,)) as pool:
+        futures = {
+            pool.submit(render_chart, chart, district, out_dir, formats, use_cache=use_cache): (chart, district)
+            for chart, district in jobs
+        }
+        for future in as_completed(futures):
+            chart, district = futures[future]
+            try:
+                saved.extend(future.result())
+            except Exception as e:
+                failed.append((chart, district, e))
+    return saved, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="차트를 화면 출력 없이 파일로 일괄 저장합니다.")
+    parser.add_argument('--districts', nargs='+', default=[DEFAULT_DISTRICT])
+    parser.add_argument('--charts', nargs='+', default=CHARTS)
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg'])
+    parser.add_argument('--out', default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--profile', action='store_true', help='단계별 시간 / 메모리를 trace 파일로 기록합니다.')
+    parser.add_argument('--no-cache', action='store_true', help='그림 캐시를 쓰지 않고 모두 다시 그립니다.')
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable()
+
+    saved, failed = render_all(args.districts, args.charts, args.formats, args.out, args.workers,
+                               use_cache=not args.no_cache)
+
+    print(f"저장된 파일: {len(saved)}개 ({args.out})")
+    for chart, district, e in failed:
+        print(f"❌ {district} / {chart}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
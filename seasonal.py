@@ -0,0 +1,185 @@
+# 계절성 분해 및 단기 예측 : 자치구 × 쓰레기 종류 월별 계열을 (계열 × 월) 행렬 하나로 묶어 일괄 처리
+#
+# - 분해 : 2×12 중심이동평균 추세 → 월별 계절 지수(합 0) → 잔차 (고전적 가법 분해)
+# - 예측 : 계절 조정 계열의 선형 추세를 연장하고 계절 지수를 더함, 잔차 표준편차로 구간 계산
+# 월별 통계는 월 코드(0~11)로 한 번에 묶어 계산하고, 월마다 따로 필터링하지 않습니다.
+
+import argparse
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from dataset import load_dataset
+from correlation import WASTE_TYPES, FOOD_RECYCLED_VALUE_COLUMNS, batch_linregress
+from data_loader import WASTE_VALUE_COLUMNS
+
+PERIOD = 12
+HORIZON = 12
+# 예측 구간 (정규분포 95%)
+INTERVAL_Z = 1.96
+
+
+# -------------------------------------------------------------
+# 1. 월 코드 기반 그룹 색인
+# -------------------------------------------------------------
+
+def month_codes(periods):
+    """Period[M] 값을 0(1월) ~ 11(12월) 월 코드 배열로 바꾼다."""
+    return pd.PeriodIndex(periods, freq='M').month.to_numpy() - 1
+
+
+def group_values(values, codes, n_groups=PERIOD):
+    """한 번의 안정 정렬로 코드별 값 배열 목록을 만든다. (코드 0 부터 순서대로)"""
+    values = np.asarray(values)
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=n_groups)
+    return np.split(values[order], np.cumsum(counts)[:-1])
+
+
+def group_means(values, codes, n_groups=PERIOD):
+    """마지막 축 기준 코드별 평균 (NaN 제외). values 가 (계열 × 월) 이면 (계열 × 그룹)."""
+    values = np.asarray(values, dtype='float64')
+    valid = ~np.isnan(values)
+    onehot = np.eye(n_groups)[codes]  # (월, 그룹)
+    sums = np.where(valid, values, 0.0) @ onehot
+    counts = valid.astype('float64') @ onehot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+# -------------------------------------------------------------
+# 2. 계열 행렬 구성
+# -------------------------------------------------------------
+
+def series_matrix(dataset=None, districts=None, waste_types=WASTE_TYPES):
+    """(자치구, 종류) 계열 목록, 연속 월 축(PeriodIndex), (계열 × 월) float64 행렬. 관측 없는 월은 NaN."""
+    if dataset is None:
+        dataset = load_dataset()
+    if districts is None:
+        districts = dataset.districts
+
+    tables = [
+        (dataset.waste, '날짜', [c for c in waste_types if c in WASTE_VALUE_COLUMNS]),
+        (dataset.food_recycled, 'Date', [c for c in waste_types if c in FOOD_RECYCLED_VALUE_COLUMNS]),
+    ]
+    observed = pd.concat([frame[column].dropna() for frame, column, _ in tables if not frame.empty])
+    periods = pd.period_range(observed.min(), observed.max(), freq='M')
+    start = periods[0].ordinal
+
+    keys = [(d, t) for d in districts for t in waste_types]
+    matrix = np.full((len(districts), len(waste_types), len(periods)), np.nan)
+    for frame, column, value_columns in tables:
+        if frame.empty or not value_columns:
+            continue
+        frame = frame.dropna(subset=[column])
+        d_pos = pd.Index(districts).get_indexer(frame['자치구'])
+        t_pos = pd.PeriodIndex(frame[column]).asi8 - start
+        keep = d_pos >= 0
+        type_pos = [waste_types.index(c) for c in value_columns]
+        matrix[d_pos[keep, None], type_pos, t_pos[keep, None]] = frame[value_columns].to_numpy('float64')[keep]
+    return keys, periods, matrix.reshape(len(keys), len(periods))
+
+
+# -------------------------------------------------------------
+# 3. 분해 / 예측
+# -------------------------------------------------------------
+
+def centered_moving_average(values, period=PERIOD):
+    """마지막 축 방향 2×period 중심이동평균. 창이 모자라는 양 끝과 결측이 있는 창은 NaN."""
+    values = np.asarray(values, dtype='float64')
+    weights = np.ones(period + 1)
+    weights[[0, -1]] = 0.5
+    weights /= period
+    trend = np.full(values.shape, np.nan)
+    half = period // 2
+    trend[..., half:values.shape[-1] - half] = sliding_window_view(values, period + 1, axis=-1) @ weights
+    return trend
+
+
+def decompose(values, periods, period=PERIOD):
+    """(계열 × 월) 행렬을 추세 / 계절 / 잔차로 한꺼번에 분해한다."""
+    values = np.asarray(values, dtype='float64')
+    codes = month_codes(periods)
+    trend = centered_moving_average(values, period)
+    seasonal_index = group_means(values - trend, codes, period)
+    # 계절 지수는 1년 합이 0 이 되도록 맞추고, 추정할 수 없는 월(관측이 짧은 계열)은 0 으로 둡니다.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        seasonal_index -= np.nanmean(seasonal_index, axis=-1, keepdims=True)
+    seasonal_index = np.nan_to_num(seasonal_index, nan=0.0)
+    seasonal = seasonal_index[..., codes]
+    return {
+        'trend': trend,
+        'seasonal': seasonal,
+        'resid': values - trend - seasonal,
+        'seasonal_index': seasonal_index,
+    }
+
+
+def forecast(values, periods, horizon=HORIZON, period=PERIOD):
+    """(계열 × 월) 행렬의 각 계열을 마지막 관측 월 이후 horizon 개월 예측한다.
+
+    (예측 월 서수(Period ordinal), 예측, 하한, 상한) 을 모두 (계열 × horizon) 배열로 돌려줍니다.
+    계열마다 관측이 끝나는 월이 달라도 각자의 마지막 관측 다음 달부터 예측합니다.
+    """
+    values = np.asarray(values, dtype='float64')
+    periods = pd.PeriodIndex(periods, freq='M')
+    seasonal_index = decompose(values, periods, period)['seasonal_index']
+
+    # 계절 조정 계열에 시간 축 선형 추세를 맞춥니다. (모든 계열을 한 번에, 결측 월은 제외)
+    t = np.arange(len(periods), dtype='float64')
+    codes = month_codes(periods)
+    adjusted = values - seasonal_index[..., codes]
+    fit = batch_linregress(t, adjusted)
+    slope, intercept = fit['slope'][..., None], fit['intercept'][..., None]
+    resid = adjusted - (intercept + slope * t)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        resid_std = np.sqrt(np.nansum(resid ** 2, axis=-1) / (fit['n'] - 2))[..., None]
+
+    # 계열별 마지막 관측 위치 다음부터의 시간 축 (계열 × horizon)
+    observed = ~np.isnan(values)
+    last = values.shape[-1] - 1 - np.argmax(observed[..., ::-1], axis=-1)
+    t_future = last[..., None] + 1 + np.arange(horizon)
+    future_codes = (codes[0] + t_future) % period
+    seasonal = np.take_along_axis(seasonal_index, future_codes, axis=-1)
+
+    point = intercept + slope * t_future + seasonal
+    future = periods[0].ordinal + t_future
+    return future, point, point - INTERVAL_Z * resid_std, point + INTERVAL_Z * resid_std
+
+
+def forecast_all(horizon=HORIZON, dataset=None, districts=None, waste_types=WASTE_TYPES):
+    """모든 자치구 × 쓰레기 종류의 예측 긴 표 (자치구, 종류, 날짜, 예측, 하한, 상한)."""
+    keys, periods, matrix = series_matrix(dataset, districts, waste_types)
+    future, point, lower, upper = forecast(matrix, periods, horizon)
+
+    frame = pd.DataFrame({
+        '자치구': np.repeat([k[0] for k in keys], horizon),
+        '종류': np.repeat([k[1] for k in keys], horizon),
+        '날짜': pd.PeriodIndex.from_ordinals(future.ravel(), freq='M'),
+        '예측': point.ravel(),
+        '하한': lower.ravel(),
+        '상한': upper.ravel(),
+    })
+    # 관측이 전혀 없는 계열(예: 음식물 파일이 없는 자치구)은 제외합니다.
+    return frame.dropna(subset=['예측']).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='모든 자치구 × 쓰레기 종류 월별 발생량 예측을 CSV 로 저장합니다.')
+    parser.add_argument('--horizon', type=int, default=HORIZON, help='예측 개월 수')
+    parser.add_argument('--out', default=os.path.join('.', 'output', 'forecast.csv'))
+    args = parser.parse_args(argv)
+
+    result = forecast_all(args.horizon)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    result.to_csv(args.out, index=False, encoding='utf-8-sig')
+    print(f"{result['자치구'].nunique()}개 자치구 × {result['종류'].nunique()}개 종류, {args.horizon}개월 예측 저장: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
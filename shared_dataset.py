@@ -0,0 +1,169 @@
+# 공유 데이터셋 : 정규 표(1인 가구 긴 표 / 월별 쓰레기 / 음식물·재활용)와 1인 가구 색인을 컬럼별 .npy 로 한 번 저장하고
+# 워커 프로세스는 메모리 맵으로 붙기만 함
+#
+# - 숫자 컬럼은 배열 그대로, 범주형은 코드 배열 + 범주 목록(JSON), Period[M] 은 ordinal 배열로 저장합니다.
+# - 붙을 때 DataFrame 컬럼이 메모리 맵 배열을 그대로 가리키므로(복사 없음) 워커 수가 늘어도
+#   같은 페이지 캐시를 공유해 데이터셋 한 벌 분량의 메모리만 씁니다.
+# - attach() 는 dataset / household 모듈의 메모를 채우므로, 워커에서 load_dataset() / load_household_index() 를
+#   부르는 기존 스크립트는 고치지 않아도 공유 데이터를 씁니다.
+#
+# 사용 예)
+#   directory = publish()                                   # 부모 프로세스에서 한 번
+#   ProcessPoolExecutor(initializer=attach, initargs=(directory,))
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import dataset as dataset_module
+import household as household_module
+from data_loader import CACHE_DIR, SINGLE_HOUSEHOLD_FILE, cache_key
+from dataset import WasteDataset, load_dataset, source_paths
+from household import HouseholdIndex, load_household_index
+from profiling import span
+
+SHARED_DIR = os.path.join(CACHE_DIR, "shared")
+# 저장 형식이 바뀌면 올려서 이전에 저장한 공유 데이터셋을 무효화합니다.
+SHARED_VERSION = 1
+
+TABLES = ('household', 'waste', 'food_recycled')
+MANIFEST_FILE = 'manifest.json'
+
+# 이 프로세스에서 붙은 디렉터리 → WasteDataset
+_attached = {}
+
+
+# -------------------------------------------------------------
+# 1. 컬럼 ↔ 배열
+# -------------------------------------------------------------
+
+def _column_arrays(series):
+    """컬럼 하나를 (저장할 배열, 복원 정보) 로 나눈다."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), {'kind': 'category', 'categories': list(dtype.categories)}
+    if isinstance(dtype, pd.PeriodDtype):
+        return series.array.asi8, {'kind': 'period', 'dtype': str(dtype)}
+    return series.to_numpy(), {'kind': 'numeric'}
+
+
+def _column_from_array(array, spec):
+    # 배열을 복사하지 않고 감싸기만 합니다.
+    if spec['kind'] == 'category':
+        return pd.Categorical.from_codes(array, dtype=pd.CategoricalDtype(spec['categories']), validate=False)
+    if spec['kind'] == 'period':
+        return pd.arrays.PeriodArray(array, dtype=pd.api.types.pandas_dtype(spec['dtype']))
+    return array
+
+
+# -------------------------------------------------------------
+# 2. 저장 (부모 프로세스에서 한 번)
+# -------------------------------------------------------------
+
+def _dataset_key(districts, household_path):
+    raw = '|'.join([str(SHARED_VERSION)] + [cache_key(p) for p in source_paths(districts, household_path)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def _write_table(frame, directory, table):
+    columns = []
+    for position, name in enumerate(frame.columns):
+        array, spec = _column_arrays(frame[name])
+        spec.update(name=name, file=f"{table}-{position}.npy")
+        np.save(os.path.join(directory, spec['file']), np.ascontiguousarray(array))
+        columns.append(spec)
+    return columns
+
+
+def publish(districts=None, household_path=SINGLE_HOUSEHOLD_FILE):
+    """정규 데이터셋을 메모리 맵용 파일로 저장하고 디렉터리 경로를 돌려준다. 원본이 그대로면 다시 쓰지 않는다."""
+    if districts is None:
+        districts = dataset_module.available_districts(household_path)
+    key = _dataset_key(districts, household_path)
+    directory = os.path.join(SHARED_DIR, key)
+    if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return directory
+
+    with span('shared_publish', 'load'):
+        dataset = load_dataset(districts, household_path)
+        index = load_household_index(household_path)
+
+        # 이전 원본으로 저장한 공유 데이터셋은 지웁니다.
+        for stale in glob.glob(os.path.join(SHARED_DIR, '*')):
+            shutil.rmtree(stale, ignore_errors=True)
+        os.makedirs(directory)
+
+        tables = {table: _write_table(getattr(dataset, table), directory, table) for table in TABLES}
+        np.save(os.path.join(directory, 'household_index-values.npy'), index.values)
+        with open(os.path.join(directory, 'extras.pkl'), 'wb') as f:
+            # 색인의 값 행렬 외 메타데이터(작은 dict / 헤더 배열)와 품질 검사 결과
+            state = {name: value for name, value in vars(index).items() if name != 'values'}
+            pickle.dump({'household_index': state, 'validation': dataset.validation}, f)
+
+        manifest = {
+            'districts': list(dataset.districts),
+            'household_path': household_path,
+            'dataset_key': list(dataset_module.dataset_key(districts, household_path)),
+            'household_key': cache_key(household_path),
+            'tables': tables,
+        }
+        # manifest 를 마지막에 써서 중간에 끊긴 저장본에는 붙지 않게 합니다.
+        with open(os.path.join(directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+    return directory
+
+
+# -------------------------------------------------------------
+# 3. 붙기 (워커 프로세스)
+# -------------------------------------------------------------
+
+def _read_table(directory, columns):
+    data = {
+        spec['name']: _column_from_array(np.load(os.path.join(directory, spec['file']), mmap_mode='r'), spec)
+        for spec in columns
+    }
+    return pd.DataFrame(data, copy=False)
+
+
+def attach(directory):
+    """저장된 공유 데이터셋을 메모리 맵으로 열어 WasteDataset 으로 돌려주고, 이 프로세스의 로더 메모에 등록한다."""
+    if directory in _attached:
+        return _attached[directory]
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(os.path.join(directory, 'extras.pkl'), 'rb') as f:
+        extras = pickle.load(f)
+
+    tables = {table: _read_table(directory, manifest['tables'][table]) for table in TABLES}
+    dataset = WasteDataset(districts=manifest['districts'], validation=extras['validation'], **tables)
+
+    index = HouseholdIndex.__new__(HouseholdIndex)
+    vars(index).update(extras['household_index'])
+    index.values = np.load(os.path.join(directory, 'household_index-values.npy'), mmap_mode='r')
+
+    # 원본이 같으면 load_dataset() / load_household_index() 가 이 객체들을 돌려줍니다.
+    dataset_module._dataset_memo[tuple(manifest['dataset_key'])] = dataset
+    household_module._index_memo[manifest['household_key']] = index
+    _attached[directory] = dataset
+    return dataset
+
+
+def shared_bytes(dataset):
+    """DataFrame 컬럼 중 메모리 맵 파일을 그대로 가리키는(복사되지 않은) 배열의 바이트 수."""
+    total = 0
+    for table in TABLES:
+        frame = getattr(dataset, table)
+        for name in frame.columns:
+            array, _ = _column_arrays(frame[name])
+            base = array
+            while getattr(base, 'base', None) is not None and not isinstance(base, np.memmap):
+                base = base.base
+            if isinstance(base, np.memmap):
+                total += array.nbytes
+    return total
@@ -0,0 +1,103 @@
+# 스트리밍 집계 : 일별·자치구별·종류별 대용량 쓰레기 피드를 청크 단위로 읽으며 월/년 집계
+#
+# 파일 전체를 메모리에 올리지 않고, 청크마다 월별 합계에 더한 뒤 버립니다.
+# 따라서 최대 메모리는 파일 크기와 상관없이 (청크 크기 + 집계 결과) 수준으로 유지됩니다.
+
+import os
+import warnings
+
+import pandas as pd
+
+from periods import detect_period_format, parse_periods
+
+CHUNK_SIZE = 500_000
+
+# 피드 원본 컬럼 이름 → 내부 컬럼 이름
+FEED_COLUMNS = {
+    'date': '날짜',
+    'district': '자치구',
+    'waste_type': '종류',
+    'tonnage': '발생량',
+}
+FEED_DTYPES = {
+    'date': 'string',
+    'district': 'category',
+    'waste_type': 'category',
+    'tonnage': 'float32',
+}
+GROUP_KEYS = ['자치구', '종류']
+
+
+def iter_feed_chunks(path, chunksize=CHUNK_SIZE, columns=FEED_COLUMNS, dtypes=FEED_DTYPES, encoding='utf-8'):
+    """고정 dtype 으로 피드를 청크 단위로 읽어 (자치구, 종류, 날짜[Period M], 발생량) 표를 하나씩 내보낸다.
+
+    각 청크의 '날짜' 변환 실패 행 수는 chunk.attrs['rejected'] 에 담깁니다.
+    """
+    format_name = None
+    reader = pd.read_csv(path, usecols=list(columns), dtype=dtypes, chunksize=chunksize, encoding=encoding)
+    for chunk in reader:
+        chunk = chunk.rename(columns=columns)
+        # 날짜 형식은 첫 청크에서 한 번만 판별합니다.
+        if format_name is None:
+            format_name = detect_period_format(chunk['날짜'])
+        chunk['날짜'], rejected = parse_periods(chunk['날짜'], format_name)
+        chunk['발생량'] = pd.to_numeric(chunk['발생량'], errors='coerce').astype('float32')
+        chunk.attrs['rejected'] = rejected
+        yield chunk
+
+
+class StreamingAggregator:
+    """청크가 들어올 때마다 (자치구, 종류, 월) / (자치구, 종류, 년도) 합계·개수를 누적한다."""
+
+    def __init__(self):
+        self._monthly = None
+        self._annual = None
+        self.rows = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _accumulate(running, chunk, keys):
+        # 저장은 float32 로 하지만 합산은 float64 로 해서 오차가 쌓이지 않게 합니다.
+        values = chunk['발생량'].astype('float64')
+        partial = values.groupby([chunk[k] for k in keys], observed=True).agg(['sum', 'count'])
+        if running is None:
+            return partial
+        return running.add(partial, fill_value=0)
+
+    def add(self, chunk):
+        chunk = chunk.dropna(subset=['날짜'])
+        chunk = chunk.assign(년도=chunk['날짜'].dt.year)
+        self._monthly = self._accumulate(self._monthly, chunk, GROUP_KEYS + ['날짜'])
+        self._annual = self._accumulate(self._annual, chunk, GROUP_KEYS + ['년도'])
+        self.rows += len(chunk)
+
+    def consume(self, chunks):
+        for chunk in chunks:
+            self.rejected += chunk.attrs.get('rejected', 0)
+            self.add(chunk)
+        return self
+
+    @staticmethod
+    def _to_frame(running, keys):
+        if running is None:
+            return pd.DataFrame(columns=keys + ['합계', '개수', '평균'])
+        frame = running.rename(columns={'sum': '합계', 'count': '개수'}).reset_index()
+        frame['개수'] = frame['개수'].astype('int64')
+        frame['평균'] = frame['합계'] / frame['개수']
+        return frame
+
+    def monthly(self):
+        """(자치구, 종류, 날짜)별 합계·개수·평균."""
+        return self._to_frame(self._monthly, GROUP_KEYS + ['날짜'])
+
+    def annual(self):
+        """(자치구, 종류, 년도)별 합계·개수·평균."""
+        return self._to_frame(self._annual, GROUP_KEYS + ['년도'])
+
+
+def aggregate_feed(path, chunksize=CHUNK_SIZE, **read_kwargs):
+    """피드 파일을 스트리밍으로 한 번 읽어 월별 / 년도별 집계 표를 돌려준다."""
+    aggregator = StreamingAggregator().consume(iter_feed_chunks(path, chunksize, **read_kwargs))
+    if aggregator.rejected:
+        warnings.warn(f"{os.path.basename(path)}: 날짜 변환 실패 {aggregator.rejected}행은 집계에서 제외했습니다.", stacklevel=2)
+    return aggregator.monthly(), aggregator.annual()
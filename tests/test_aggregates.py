@@ -0,0 +1,71 @@
+import pandas as pd
+
+from aggregates import AnnualAggregateStore
+
+
+def _monthly(start, end):
+    periods = pd.period_range(start, end, freq='M')
+    return pd.DataFrame({'날짜': periods, 'SUM': [float(p.month) for p in periods]})
+
+
+def _full(monthly):
+    return monthly.groupby(monthly['날짜'].dt.year)['SUM'].sum().to_dict()
+
+
+def test_new_months_are_added(tmp_path):
+    path = tmp_path / 'annual.json'
+    store = AnnualAggregateStore()
+    store.update(_monthly('2019-01', '2020-06'), 'SUM')
+    store.save(str(path))
+
+    monthly = _monthly('2019-01', '2021-03')
+    store = AnnualAggregateStore.load(str(path))
+    assert store.update(monthly, 'SUM') == [2020, 2021]
+    assert store.sums == _full(monthly)
+
+
+def test_historical_month_edit_triggers_rebuild(tmp_path):
+    path = tmp_path / 'annual.json'
+    monthly = _monthly('2019-01', '2020-12')
+    store = AnnualAggregateStore()
+    store.update(monthly, 'SUM')
+    store.save(str(path))
+
+    # 행 수는 그대로 두고 지난 달 값만 고칩니다.
+    edited = monthly.copy()
+    edited.loc[edited['날짜'] == pd.Period('2019-01', freq='M'), 'SUM'] = 99999.0
+    store = AnnualAggregateStore.load(str(path))
+    assert store.update(edited, 'SUM')
+    assert store.sums == _full(edited)
+    assert store.to_frame().set_index('년도').loc[2019, '총_발생량'] == _full(edited)[2019]
+
+    # 고친 내용을 저장한 뒤 같은 표가 다시 들어오면 다시 집계하지 않습니다.
+    store.save(str(path))
+    assert AnnualAggregateStore.load(str(path)).update(edited, 'SUM') == []
+
+
+def _save_and_load(path, rounds=50):
+    monthly = _monthly('2019-01', '2020-12')
+    for _ in range(rounds):
+        store = AnnualAggregateStore.load(path)
+        store.update(monthly, 'SUM')
+        store.save(path)
+    return AnnualAggregateStore.load(path).sums
+
+
+def test_concurrent_saves_never_expose_partial_file(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = str(tmp_path / 'annual.json')
+    with ProcessPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(_save_and_load, [path] * 8))
+    assert all(sums == _full(_monthly('2019-01', '2020-12')) for sums in results)
+
+
+def test_unreadable_state_rebuilds(tmp_path):
+    path = tmp_path / 'annual.json'
+    path.write_text('{"watermark": ', encoding='utf-8')
+    store = AnnualAggregateStore.load(str(path))
+    monthly = _monthly('2019-01', '2020-12')
+    assert store.update(monthly, 'SUM') == [2019, 2020]
+    assert store.sums == _full(monthly)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from anomaly import MISSING, SPIKE, SeasonalDetector, score_months
+
+KEYS = [('A', 'SUM'), ('B', 'SUM')]
+
+
+def _matrix(periods, ends):
+    # 계열마다 ends 달까지만 값이 있는 계절 패턴. B 의 2021-07 은 큰 급증입니다.
+    rng = np.random.default_rng(0)
+    months = np.array([p.month for p in periods])
+    matrix = 1000 + 100 * np.sin(months / 12 * 2 * np.pi) + rng.normal(0, 5, (len(KEYS), len(periods)))
+    matrix[1, list(periods).index(pd.Period('2021-07', freq='M'))] += 5000
+    for i, end in enumerate(ends):
+        matrix[i, [p > pd.Period(end, freq='M') for p in periods]] = np.nan
+    return matrix
+
+
+def _split_run(periods, first, second, tmp_path):
+    state, keys = str(tmp_path / 'state.npz'), str(tmp_path / 'keys.json')
+    detector = SeasonalDetector(KEYS)
+    before = score_months(detector, periods, first)
+    detector.save(state, keys)
+    after = score_months(SeasonalDetector.load(KEYS, state, keys), periods, second)
+    return pd.concat([f for f in (before, after) if not f.empty], ignore_index=True).sort_values('날짜', kind='stable', ignore_index=True)
+
+
+def test_lagging_series_is_scored_after_split(tmp_path):
+    periods = list(pd.period_range('2019-01', '2021-12', freq='M'))
+    full = _matrix(periods, ['2021-12', '2021-12'])
+    single = score_months(SeasonalDetector(KEYS), periods, full)
+    assert ((single['자치구'] == 'B') & (single['판정'] == SPIKE)).any()
+
+    # 첫 실행에서 A 는 2021-10 까지, B 는 2021-03 까지만 들어와 있었습니다.
+    split = _split_run(periods, _matrix(periods, ['2021-10', '2021-03']), full, tmp_path)
+    pd.testing.assert_frame_equal(split, single)
+
+
+def test_end_of_feed_is_not_missing():
+    periods = list(pd.period_range('2019-01', '2021-12', freq='M'))
+    matrix = _matrix(periods, ['2021-12', '2020-09'])
+    matrix[0, periods.index(pd.Period('2020-03', freq='M'))] = np.nan
+
+    missing = score_months(SeasonalDetector(KEYS), periods, matrix).query('판정 == @MISSING')
+    assert missing[['자치구', '날짜']].values.tolist() == [['A', pd.Period('2020-03', freq='M')]]
@@ -0,0 +1,16 @@
+import numpy as np
+
+from bootstrap import correlation_intervals, permutation_test
+
+
+def test_constant_series_has_no_p_value():
+    x = np.arange(8, dtype='float64')
+    assert np.isnan(permutation_test(x, np.full(8, 3.0), n_resamples=500)['p_value'])
+    assert np.isnan(permutation_test(np.full(8, 3.0), x, n_resamples=500)['p_value'])
+    assert np.isnan(correlation_intervals(x, np.full(8, 3.0), n_resamples=500)['p_value'])
+
+
+def test_strong_correlation_is_significant():
+    x = np.arange(10, dtype='float64')
+    result = permutation_test(x, 2 * x + np.sin(x), n_resamples=2000)
+    assert result['p_value'] < 0.01
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from correlation import WASTE_TYPES, batch_linregress, lagged, waste_cube
+from dataset import WasteDataset
+from data_loader import WASTE_VALUE_COLUMNS
+
+
+def _dataset(periods):
+    # 종로구 한 곳의 월별 쓰레기 표. 음식물·재활용은 비워 둡니다.
+    waste = pd.DataFrame({'날짜': pd.PeriodIndex(periods, freq='M')})
+    for column in WASTE_VALUE_COLUMNS:
+        waste[column] = np.arange(1, len(periods) + 1, dtype='float32')
+    waste['자치구'] = pd.Categorical(['종로구'] * len(periods))
+    food = pd.DataFrame(columns=['Date', 'Food_Waste', 'Recycled_Waste', '자치구'])
+    return WasteDataset(household=None, waste=waste, food_recycled=food, districts=['종로구'])
+
+
+def test_partial_year_is_nan():
+    # 2019-01 ~ 2021-05 : 2021년은 5개월뿐입니다.
+    dataset = _dataset(pd.period_range('2019-01', '2021-05', freq='M'))
+    years = [2019, 2020, 2021]
+    cube = waste_cube(dataset, ['종로구'], years)
+    total = WASTE_TYPES.index('SUM')
+    assert not np.isnan(cube[0, total, :2]).any()
+    assert np.isnan(cube[0, total, 2])
+
+
+def test_partial_year_never_enters_lag_pair():
+    dataset = _dataset(pd.period_range('2015-01', '2021-05', freq='M'))
+    years = list(range(2015, 2022))
+    y = waste_cube(dataset, ['종로구'], years)[0, WASTE_TYPES.index('SUM')]  # (년도,)
+    x = lagged(np.arange(len(years), dtype='float64') * 100 + 1000, (0, 1, 2))  # (시차, 년도)
+
+    result = batch_linregress(x, y[None, :])
+    # 2015~2020 의 완전한 6개 해에서 시차만큼 앞쪽 해가 빠집니다. 2021년(5개월)은 어느 시차에도 들어가지 않습니다.
+    assert result['n'].tolist() == [6, 5, 4]
+    for lag in (0, 1, 2):
+        paired = ~np.isnan(x[lag]) & ~np.isnan(y)
+        assert not paired[years.index(2021)]
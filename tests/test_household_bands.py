@@ -0,0 +1,84 @@
+import csv
+import functools
+
+import numpy as np
+import pytest
+
+import benchmark
+import data_loader
+from dataset import build_dataset
+from household import load_household_index
+from validation import MISSING_VALUE
+
+BANDS = ['20세미만', '20~24세', '25~29세']
+NEW_BAND = '90세이상'
+# 2025년 블록에만 새 연령대가 있습니다.
+YEAR_BANDS = {2025: BANDS + [NEW_BAND], 2024: BANDS, 2023: BANDS, 2022: BANDS, 2021: BANDS, 2020: BANDS}
+DISTRICTS = ['가상0000구']
+
+
+def _write_household(path, rng):
+    columns = [(year, band) for year, bands in YEAR_BANDS.items() for band in ['소계'] + bands]
+    ids = ['자치구별(1)', '자치구별(2)', '성별(1)']
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ids + [str(y) for y, _ in columns])
+        writer.writerow(ids + ['합계'] * len(columns))
+        writer.writerow(ids + [b for _, b in columns])
+        for district in DISTRICTS:
+            by_sex = {year: rng.integers(100, 3000, size=(2, len(bands))) for year, bands in YEAR_BANDS.items()}
+            for s, sex in enumerate(['계', '남자', '여자']):
+                row = []
+                for year in YEAR_BANDS:
+                    counts = by_sex[year].sum(axis=0) if s == 0 else by_sex[year][s - 1]
+                    row += [int(counts.sum())] + counts.tolist()
+                writer.writerow(['합계', district, sex] + row)
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'CACHE_DIR', str(tmp_path / '.cache'))
+    rng = np.random.default_rng(0)
+    directory = str(tmp_path)
+    path = benchmark.household_file(directory)
+    _write_household(path, rng)
+    benchmark.write_waste_csvs(directory, DISTRICTS, rng)
+    dataset = build_dataset(
+        DISTRICTS, path,
+        waste_file=functools.partial(benchmark.waste_file, directory),
+        food_file=functools.partial(benchmark.food_file, directory),
+    )
+    return dataset, path
+
+
+def test_new_band_does_not_break_validation(source):
+    dataset, path = source
+    assert NEW_BAND in load_household_index(path).bands
+    # 이전 년도에 없는 연령대 칸은 값 누락이 아닙니다.
+    assert not (dataset.validation.quarantine['검사'] == MISSING_VALUE).any()
+
+
+def test_household_cube_fills_absent_band_with_nan(source):
+    from correlation import correlation_matrix, household_cube
+
+    dataset, path = source
+    index = load_household_index(path)
+    years = list(range(2019, 2026))
+    cube = household_cube(index, DISTRICTS, years)  # (자치구, 연령대, 년도)
+    band = index.bands.index(NEW_BAND)
+    assert np.isnan(cube[0, band, :-1]).all()
+    assert not np.isnan(cube[0, band, -1])
+    assert np.isnan(cube[0, :, years.index(2019)]).all()  # 파일에 없는 년도
+
+    matrix = correlation_matrix(DISTRICTS, dataset=dataset, household_path=path)
+    assert matrix.get(DISTRICTS[0], NEW_BAND, 'SUM')['n'] == 0
+
+
+def test_cube_fills_absent_band_with_nan(source):
+    from cube import AggregateCube, build_cube_arrays
+
+    dataset, path = source
+    cube = AggregateCube(*build_cube_arrays(dataset, path))
+    assert np.isnan(cube.households(DISTRICTS[0], 2024, band=NEW_BAND))
+    assert cube.households(DISTRICTS[0], 2025, band=NEW_BAND) > 0
+    assert cube.households(None, 2024, band=BANDS) == cube.households(DISTRICTS[0], 2024, band=BANDS)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+import monthly
+from household import COUNT_COLUMN, district_annual, load_household_index
+
+
+def test_join_aligns_interpolated_household_by_month(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'CACHE_DIR', str(tmp_path))
+    joined = monthly.join_monthly()
+
+    assert joined['날짜'].is_unique and not joined[COUNT_COLUMN].isna().any()
+    # 기준 월(12월)에는 년도별 값이 그대로 들어갑니다.
+    annual = district_annual(load_household_index(), data_loader.DEFAULT_DISTRICT).set_index('년도')[COUNT_COLUMN]
+    december = joined[joined['날짜'].dt.month == monthly.ANCHOR_MONTH]
+    expected = annual.loc[december['날짜'].dt.year].to_numpy()
+    np.testing.assert_allclose(december[COUNT_COLUMN].to_numpy(), expected)
+    assert monthly.monthly_regression(joined=joined)['n'] == len(joined)
+
+
+def test_interpolated_grid_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(data_loader, '_memo', {})
+    first = monthly.monthly_household()
+
+    # 디스크 캐시에서 읽으므로 다시 보간하지 않습니다.
+    monkeypatch.setattr(data_loader, '_memo', {})
+    monkeypatch.setattr(monthly, '_build_grid', lambda *args: (_ for _ in ()).throw(AssertionError('rebuilt')))
+    pd.testing.assert_frame_equal(monthly.monthly_household(), first)
+    assert len(list(tmp_path.glob('monthly_household-*'))) == 1
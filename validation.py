@@ -0,0 +1,258 @@
+# 데이터 품질 검사 : 원본을 읽을 때 표 전체를 컬럼 단위로 한 번만 훑어 모든 검사를 수행하고 실패 행을 격리 표로 모음
+#
+# - 월별 생활쓰레기 : SUM = 매립 + 소각 (허용 오차), 값 누락('-' 등), 음수, 년월 변환 실패, 빠진 월 / 중복 월
+# - 음식물 / 재활용 : 값 누락, 음수, 년월 변환 실패, 빠진 월 / 중복 월
+# - 1인 가구        : 소계 = 연령대 합, 값 누락, 음수
+# 격리 표는 (표, 자치구, 구분, 기간, 검사, 내용) 한 행이 실패한 검사 하나입니다.
+# 실패 행을 정규 데이터셋에서 지우지는 않습니다. (지우면 빠진 월이 생겨 년도 합계가 달라짐)
+#
+# 사용 예) python validation.py --out ./output/quarantine.csv
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_loader import WASTE_VALUE_COLUMNS, FOOD_RECYCLED_COLUMNS, HOUSEHOLD_HEADER_ROWS, SINGLE_HOUSEHOLD_FILE
+from profiling import traced
+
+# SUM 과 (매립 + 소각) 의 허용 오차: |차이| <= 절대 + 상대 × |SUM| (float32 반올림 고려)
+SUM_ABS_TOLERANCE = 0.01
+SUM_REL_TOLERANCE = 1e-5
+
+FOOD_RECYCLED_VALUE_COLUMNS = FOOD_RECYCLED_COLUMNS[1:]
+QUARANTINE_COLUMNS = ['표', '자치구', '구분', '기간', '검사', '내용']
+
+# 검사 이름
+SUM_MISMATCH = 'SUM 불일치'
+MISSING_VALUE = '값 누락'
+NEGATIVE_VALUE = '음수'
+BAD_PERIOD = '년월 변환 실패'
+MISSING_MONTH = '빠진 월'
+DUPLICATE_MONTH = '중복 월'
+SUBTOTAL_MISMATCH = '소계 불일치'
+
+
+def _empty_quarantine():
+    return pd.DataFrame(columns=QUARANTINE_COLUMNS)
+
+
+def _flagged(table, checks, district, period, details, group=''):
+    """(행 × 검사) 실패 마스크에서 실패 칸만 골라 격리 표 행으로 만든다. details[검사] 는 행 위치 → 내용 함수."""
+    names = list(checks)
+    masks = np.column_stack([np.asarray(checks[name], dtype=bool) for name in names]) if names else None
+    if masks is None or not masks.any():
+        return _empty_quarantine()
+    rows, which = np.nonzero(masks)
+    return pd.DataFrame({
+        '표': table,
+        '자치구': np.asarray(district, dtype=object)[rows],
+        '구분': group if np.isscalar(group) else np.asarray(group, dtype=object)[rows],
+        '기간': np.asarray(period, dtype=object)[rows],
+        '검사': np.asarray(names, dtype=object)[which],
+        '내용': [details[names[w]](r) for r, w in zip(rows, which)],
+    })
+
+
+# -------------------------------------------------------------
+# 1. 월별 표 검사
+# -------------------------------------------------------------
+
+def _month_gaps(table, districts, periods):
+    # (자치구, 년월) 로 한 번 정렬한 뒤 이웃 간 간격으로 빠진 월 / 중복 월을 찾습니다.
+    valid = ~periods.isna().to_numpy()
+    codes = pd.Categorical(districts[valid]).codes
+    names = np.asarray(districts[valid], dtype=object)
+    ordinals = periods.array.asi8[valid]
+    order = np.lexsort((ordinals, codes))
+    codes, names, ordinals = codes[order], names[order], ordinals[order]
+
+    same = codes[1:] == codes[:-1]
+    step = np.diff(ordinals)
+    gap = same & (step > 1)
+    duplicate = same & (step == 0)
+
+    month = lambda ordinal: str(pd.Period(ordinal=int(ordinal), freq='M'))  # noqa: E731
+    frames = []
+    if gap.any():
+        at = np.nonzero(gap)[0]
+        frames.append(pd.DataFrame({
+            '표': table, '자치구': names[at + 1], '구분': '',
+            '기간': [month(o + 1) for o in ordinals[at]],
+            '검사': MISSING_MONTH,
+            '내용': [f"{s - 1}개월 누락 ({month(o + 1)} ~ {month(o + s - 1)})" for o, s in zip(ordinals[at], step[at])],
+        }))
+    if duplicate.any():
+        at = np.nonzero(duplicate)[0]
+        frames.append(pd.DataFrame({
+            '표': table, '자치구': names[at + 1], '구분': '',
+            '기간': [month(o) for o in ordinals[at]], '검사': DUPLICATE_MONTH, '내용': '같은 년월 행이 2개 이상',
+        }))
+    return frames
+
+
+def _monthly_checks(frame, period_column, value_columns):
+    # 값 누락 / 음수 / 년월 변환 실패 마스크를 (행 × 컬럼) 배열 한 번으로 계산합니다.
+    values = frame[value_columns].to_numpy(dtype='float64')
+    missing = np.isnan(values)
+    with np.errstate(invalid='ignore'):
+        negative = values < 0
+    periods = frame[period_column]
+    labels = np.where(periods.isna(), '', periods.astype(str))
+
+    def columns_of(mask):
+        return lambda r: ', '.join(c for c, bad in zip(value_columns, mask[r]) if bad)
+
+    checks = {
+        MISSING_VALUE: missing.any(axis=1),
+        NEGATIVE_VALUE: negative.any(axis=1),
+        BAD_PERIOD: periods.isna().to_numpy(),
+    }
+    details = {
+        MISSING_VALUE: lambda r: f"{columns_of(missing)(r)} 값 없음 "
+                                 f"({', '.join(f'{c}={v:,.2f}' for c, v in zip(value_columns, values[r]) if v == v)})",
+        NEGATIVE_VALUE: lambda r: f"{columns_of(negative)(r)} < 0",
+        BAD_PERIOD: lambda r: '년월을 해석할 수 없음',
+    }
+    return values, checks, details, labels
+
+
+@traced('validate')
+def validate_waste(frame, abs_tolerance=SUM_ABS_TOLERANCE, rel_tolerance=SUM_REL_TOLERANCE):
+    """월별 생활쓰레기 표(자치구, 날짜, SUM / 매립 / 소각)의 격리 행."""
+    table = '생활쓰레기'
+    if frame.empty:
+        return _empty_quarantine()
+    values, checks, details, labels = _monthly_checks(frame, '날짜', WASTE_VALUE_COLUMNS)
+    total, parts = values[:, 0], values[:, 1:].sum(axis=1)
+    # 성분 값이 없는 행은 '값 누락'으로만 보고 합계 비교에서는 뺍니다.
+    checks[SUM_MISMATCH] = np.abs(total - parts) > abs_tolerance + rel_tolerance * np.abs(total)
+    details[SUM_MISMATCH] = lambda r: f"SUM={total[r]:,.2f}, 매립+소각={parts[r]:,.2f}"
+
+    districts = frame['자치구'].astype(object).to_numpy()
+    frames = [_flagged(table, checks, districts, labels, details)]
+    frames += _month_gaps(table, frame['자치구'].astype(object), frame['날짜'])
+    return pd.concat(frames, ignore_index=True)
+
+
+@traced('validate')
+def validate_food_recycled(frame):
+    """월별 음식물 / 재활용 표(자치구, Date, Food_Waste / Recycled_Waste)의 격리 행."""
+    table = '음식물_재활용'
+    if frame.empty:
+        return _empty_quarantine()
+    _, checks, details, labels = _monthly_checks(frame, 'Date', FOOD_RECYCLED_VALUE_COLUMNS)
+    districts = frame['자치구'].astype(object).to_numpy()
+    frames = [_flagged(table, checks, districts, labels, details)]
+    frames += _month_gaps(table, frame['자치구'].astype(object), frame['Date'])
+    return pd.concat(frames, ignore_index=True)
+
+
+# -------------------------------------------------------------
+# 2. 1인 가구 표 검사
+# -------------------------------------------------------------
+
+@traced('validate')
+def validate_household(index, df_raw):
+    """1인 가구 원본의 격리 행. 셀 전체를 한 번에 숫자로 바꿔 (행, 년도, 연령대) 배열에서 검사한다."""
+    from household import ID_COLUMN_COUNT, TOTAL_BAND, TOTAL_GROUP, take_columns
+
+    table = '1인가구'
+    # 색인의 값 행렬은 빈 칸을 0 으로 채우므로, 누락 검사는 원본 문자열에서 한 번 변환해서 합니다.
+    cells = df_raw.iloc[HOUSEHOLD_HEADER_ROWS:, ID_COLUMN_COUNT:].to_numpy().ravel()
+    values = pd.to_numeric(pd.Series(cells), errors='coerce').to_numpy().reshape(len(index.row_districts), -1)
+
+    bands = [b for b in index.bands if b != TOTAL_BAND]
+    # 년도마다 연령대 구성이 다를 수 있으므로 헤더에 없는 (년도, 연령대) 칸은 NaN 으로 두고 누락으로 보지 않습니다.
+    positions = index.column_positions(index.years, [TOTAL_BAND] + bands, TOTAL_GROUP, allow_missing=True)
+    cube = take_columns(values, np.arange(len(values))[:, None, None], positions[None])  # (행, 년도, 연령대)
+    subtotal, parts = cube[:, :, 0], np.nansum(cube[:, :, 1:], axis=2)
+
+    missing = np.isnan(cube) & (positions[None] >= 0)
+    with np.errstate(invalid='ignore'):
+        negative = cube < 0
+        mismatch = ~missing.any(axis=2) & (subtotal != parts)
+
+    # (행, 년도) 를 한 행으로 펼칩니다.
+    n_rows, n_years = subtotal.shape
+    district = np.repeat(index.row_districts, n_years)
+    sex = np.repeat(index.row_sexes, n_years)
+    year = np.tile(np.asarray(index.years), n_rows)
+    missing, negative = missing.reshape(n_rows * n_years, -1), negative.reshape(n_rows * n_years, -1)
+    subtotal, parts = subtotal.ravel(), parts.ravel()
+    all_bands = [TOTAL_BAND] + bands
+
+    checks = {
+        SUBTOTAL_MISMATCH: mismatch.ravel(),
+        MISSING_VALUE: missing.any(axis=1),
+        NEGATIVE_VALUE: negative.any(axis=1),
+    }
+    details = {
+        SUBTOTAL_MISMATCH: lambda r: f"소계={subtotal[r]:,.0f}, 연령대 합={parts[r]:,.0f}",
+        MISSING_VALUE: lambda r: f"{', '.join(b for b, bad in zip(all_bands, missing[r]) if bad)} 값 없음",
+        NEGATIVE_VALUE: lambda r: f"{', '.join(b for b, bad in zip(all_bands, negative[r]) if bad)} < 0",
+    }
+    return _flagged(table, checks, district, year.astype(str), details, group=sex)
+
+
+# -------------------------------------------------------------
+# 3. 전체 검사 / 보고
+# -------------------------------------------------------------
+
+class ValidationReport:
+    """검사한 행 수와 격리 표."""
+
+    def __init__(self, quarantine, checked):
+        self.quarantine = quarantine  # QUARANTINE_COLUMNS
+        self.checked = checked        # 표 → 검사한 행 수
+
+    @property
+    def ok(self):
+        return self.quarantine.empty
+
+    def summary(self):
+        """(표, 검사)별 격리 행 수."""
+        if self.quarantine.empty:
+            return pd.DataFrame(columns=['표', '검사', '행수'])
+        return self.quarantine.groupby(['표', '검사']).size().rename('행수').reset_index()
+
+
+def validate_tables(household_index, household_raw, waste, food_recycled):
+    """정규 표들을 한 번씩만 훑어 모든 검사를 수행한다."""
+    frames = [
+        validate_household(household_index, household_raw),
+        validate_waste(waste),
+        validate_food_recycled(food_recycled),
+    ]
+    frames = [f for f in frames if not f.empty]
+    quarantine = pd.concat(frames, ignore_index=True) if frames else _empty_quarantine()
+    checked = {
+        '1인가구': len(household_index.row_districts) * len(household_index.years),
+        '생활쓰레기': len(waste),
+        '음식물_재활용': len(food_recycled),
+    }
+    return ValidationReport(quarantine, checked)
+
+
+def main(argv=None):
+    from dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="원본 데이터 품질 검사 / 격리 표 저장")
+    parser.add_argument('--out', default=None, help='격리 표를 저장할 CSV 경로')
+    parser.add_argument('--strict', action='store_true', help='격리 행이 있으면 종료 코드 1')
+    args = parser.parse_args(argv)
+
+    report = load_dataset(household_path=SINGLE_HOUSEHOLD_FILE).validation
+    print(f"검사한 행: {', '.join(f'{table} {n:,}' for table, n in report.checked.items())}")
+    if report.ok:
+        print("격리 행 없음")
+    else:
+        print(report.quarantine.to_markdown(index=False, numalign="left", stralign="left"))
+    if args.out:
+        report.quarantine.to_csv(args.out, index=False, encoding='utf-8-sig')
+        print(f"격리 표 {len(report.quarantine)}행 → {args.out}")
+    return 1 if args.strict and not report.ok else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,370 @@
+# 통합 실행기 : 분석 스크립트들을 의존 그래프(DAG)의 단계로 묶어 한 번에 실행
+#
+# 사용 예) python wasteanalysis.py run --district 종로구 --analyses trend,seasonality,correlation
+#
+# - 단계 결과는 (단계 버전, 자치구, 원본 파일 캐시 키, 선행 단계 키) 해시로 디스크에 저장됩니다.
+#   원본이 그대로면 다시 계산하지 않고, 분석을 하나 더 요청하면 바뀐 단계만 실행합니다.
+# - 서로 의존하지 않는 단계는 프로세스 풀에서 동시에 실행합니다.
+
+import argparse
+import functools
+import glob
+import hashlib
+import importlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+import profiling
+from profiling import span
+
+from data_loader import (
+    CACHE_DIR, CACHE_VERSION, DEFAULT_DISTRICT, SINGLE_HOUSEHOLD_FILE, cache_key,
+    waste_monthly_file, food_recycled_file,
+)
+
+STAGE_DIR = os.path.join(CACHE_DIR, "stages")
+OUTPUT_DIR = "./output"
+
+
+# -------------------------------------------------------------
+# 1. 단계 정의
+# -------------------------------------------------------------
+
+class Stage:
+    """단계 하나: run(district, *선행 단계 결과) 를 실행하고, 결과는 입력 해시로 캐시된다."""
+
+    def __init__(self, name, run, deps=(), inputs=(), modules=(), version=1, output=False):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.inputs = tuple(inputs)    # district → 원본 파일 경로 함수 목록
+        self.modules = tuple(modules)  # 소스가 바뀌면 캐시를 무효화할 모듈 이름 목록
+        self.version = version       # 단계 로직이 바뀌면 올려서 캐시를 무효화합니다.
+        self.output = output         # 결과를 출력 폴더에 저장하는 단계인지
+
+
+def _household_file(district):
+    return SINGLE_HOUSEHOLD_FILE
+
+
+WASTE_INPUTS = (waste_monthly_file,)
+ALL_INPUTS = (_household_file, waste_monthly_file, food_recycled_file)
+MONTHLY_INPUTS = (_household_file, waste_monthly_file)
+
+
+def _load_chart_data(chart, district):
+    return importlib.import_module(chart).load_data(district)
+
+
+def _render_chart(chart, district, data, out_dir, formats):
+    from render import render_chart
+    return render_chart(chart, district, out_dir, formats, data=data)
+
+
+def _annual(district):
+    from aggregates import annual_aggregates
+    return annual_aggregates(district)
+
+
+def _forecast(district):
+    from seasonal import forecast_all
+    return forecast_all(districts=[district])
+
+
+def _correlation(district):
+    from correlation import correlation_matrix
+    return correlation_matrix(districts=[district]).to_frame()
+
+
+def _monthly_join(district):
+    from monthly import join_monthly
+    return join_monthly(district)
+
+
+def _monthly_correlation(district, joined):
+    from data_loader import WASTE_VALUE_COLUMNS
+    from monthly import monthly_regression
+    rows = [{'종류': column, **monthly_regression(district, column, joined=joined)} for column in WASTE_VALUE_COLUMNS]
+    return pd.DataFrame(rows)
+
+
+def _bootstrap(district, merged):
+    from bootstrap import correlation_intervals
+    return pd.DataFrame([correlation_intervals(merged['총_1인가구수'], merged['총_쓰레기_발생량'])])
+
+
+def _composition(district):
+    from composition import composition_table
+    from dataset import load_dataset
+    return composition_table(load_dataset(), districts=[district])
+
+
+def _validation(district):
+    from dataset import load_dataset
+    quarantine = load_dataset().validation.quarantine
+    return quarantine[quarantine['자치구'] == district].reset_index(drop=True)
+
+
+def _anomaly(district):
+    from anomaly import detect_anomalies
+    return detect_anomalies(districts=[district])
+
+
+def _build_stages():
+    stages = {
+        'annual': Stage('annual', _annual, inputs=WASTE_INPUTS, modules=['aggregates'], output=True),
+        'forecast': Stage('forecast', _forecast, inputs=ALL_INPUTS, modules=['seasonal'], output=True),
+        'correlation': Stage('correlation', _correlation, inputs=ALL_INPUTS, modules=['correlation', 'household'],
+                             output=True),
+        'monthly_join': Stage('monthly_join', _monthly_join, inputs=MONTHLY_INPUTS, modules=['monthly', 'household'],
+                              output=True),
+        'monthly_correlation': Stage('monthly_correlation', _monthly_correlation, deps=['monthly_join'],
+                                     modules=['monthly', 'correlation'], output=True),
+        'bootstrap': Stage('bootstrap', _bootstrap, deps=['data:alpa_plot1'], modules=['bootstrap'], output=True),
+        'composition': Stage('composition', _composition, inputs=ALL_INPUTS, modules=['composition', 'seasonal'],
+                             output=True),
+        'validation': Stage('validation', _validation, inputs=ALL_INPUTS, modules=['validation', 'dataset'],
+                            output=True),
+        'anomaly': Stage('anomaly', _anomaly, inputs=ALL_INPUTS, modules=['anomaly', 'seasonal'], output=True),
+    }
+    from figure_cache import STYLE_MODULES
+    from render import CHARTS
+    for chart in CHARTS:
+        stages[f'data:{chart}'] = Stage(f'data:{chart}', functools.partial(_load_chart_data, chart),
+                                        inputs=ALL_INPUTS, modules=[chart])
+        stages[f'chart:{chart}'] = Stage(f'chart:{chart}', functools.partial(_render_chart, chart),
+                                         deps=[f'data:{chart}'], modules=[chart, 'render', *STYLE_MODULES],
+                                         output=True)
+    return stages
+
+
+STAGES = _build_stages()
+
+# 분석 이름 → 최종 단계 목록
+ANALYSES = {
+    'trend': ['chart:basic_plot1', 'annual'],
+    'seasonality': ['chart:basic_plot2', 'forecast'],
+    'household': ['chart:basic_plot3', 'chart:basic_plot4'],
+    'food': ['chart:basic_plot5'],
+    'correlation': ['chart:alpa_plot1', 'chart:alpha_plot2', 'correlation', 'bootstrap', 'monthly_correlation'],
+    'composition': ['chart:alpa_plot3', 'composition'],
+    'quality': ['validation', 'anomaly'],
+}
+
+
+# -------------------------------------------------------------
+# 2. 실행 계획 (입력 해시 / 필요한 단계)
+# -------------------------------------------------------------
+
+def required_stages(targets):
+    """목표 단계와 그 선행 단계 전체를 위상 정렬 순서로 돌려준다."""
+    order, seen = [], set()
+
+    def visit(name, path=()):
+        if name in path:
+            raise ValueError(f"단계 의존 관계에 순환이 있습니다: {' → '.join(path + (name,))}")
+        if name in seen:
+            return
+        if name not in STAGES:
+            raise KeyError(f"알 수 없는 단계입니다: {name}")
+        for dep in STAGES[name].deps:
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for target in targets:
+        visit(target)
+    return order
+
+
+def stage_keys(names, district, extra=''):
+    """단계별 입력 해시. 원본 파일 캐시 키, 단계 모듈의 소스 해시, 선행 단계 키를 모두 포함한다."""
+    from figure_cache import code_digest
+    keys = {}
+    for name in names:
+        stage = STAGES[name]
+        parts = [name, str(stage.version), str(CACHE_VERSION), district, extra]
+        for path_of in stage.inputs:
+            path = path_of(district)
+            parts.append(cache_key(path) if os.path.exists(path) else f"missing:{path}")
+        parts.extend(code_digest(module) for module in stage.modules)
+        parts.extend(keys[dep] for dep in stage.deps)
+        keys[name] = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+    return keys
+
+
+def _stage_path(name, district, key):
+    prefix = f"{name.replace(':', '_')}-{district}"
+    return prefix, os.path.join(STAGE_DIR, f"{prefix}-{key}.pkl")
+
+
+def _load_stage(name, district, key):
+    _, path = _stage_path(name, district, key)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        result = pickle.load(f)
+    # 차트 단계는 저장된 파일이 지워졌다면 다시 그립니다.
+    if name.startswith('chart:') and not all(os.path.exists(p) for p in result):
+        return None
+    return result
+
+
+def _save_stage(name, district, key, result):
+    prefix, path = _stage_path(name, district, key)
+    os.makedirs(STAGE_DIR, exist_ok=True)
+    for stale in glob.glob(os.path.join(STAGE_DIR, f"{prefix}-*.pkl")):
+        os.remove(stale)
+    with open(path, 'wb') as f:
+        pickle.dump(result, f)
+
+
+# -------------------------------------------------------------
+# 3. 실행
+# -------------------------------------------------------------
+
+def _init_worker(shared_dir=None):
+    from render import _init_worker as init_render_worker
+    init_render_worker(shared_dir)
+
+
+def _execute(name, district, dep_results, out_dir, formats):
+    # 워커에서 실행: 단계 하나를 계산한다.
+    stage = STAGES[name]
+    try:
+        with span(f"stage:{name}", 'stage', district=district):
+            if name.startswith('chart:'):
+                return stage.run(district, *dep_results, out_dir, formats)
+            return stage.run(district, *dep_results)
+    finally:
+        profiling.flush()
+
+
+def run_pipeline(targets, district=DEFAULT_DISTRICT, out_dir=OUTPUT_DIR, formats=('png',), workers=None, force=False):
+    """목표 단계들을 실행한다. (단계 결과 dict, 실행한 단계 목록, 실패 목록)을 돌려준다."""
+    names = required_stages(targets)
+    # 차트 파일 경로가 출력 폴더 / 형식에 따라 달라지므로 키에 포함합니다.
+    keys = stage_keys(names, district, extra=f"{os.path.abspath(out_dir)}|{','.join(formats)}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    results, executed, failed = {}, [], []
+    # 캐시된 결과가 있는 단계는 선행 단계가 필요할 때까지 불러오지 않습니다.
+    needed = set()
+    for name in reversed(names):
+        if name in targets or any(name in STAGES[n].deps for n in needed):
+            cached = None if force else _load_stage(name, district, keys[name])
+            if cached is not None:
+                results[name] = cached
+            else:
+                needed.add(name)
+    pending = [n for n in names if n in needed]
+    if not pending:
+        # 모두 캐시된 결과면 워커도, 공유 데이터셋도 만들지 않습니다.
+        return results, executed, failed
+
+    def ready(name):
+        return all(dep in results for dep in STAGES[name].deps)
+
+    def finish(name, result):
+        results[name] = result
+        executed.append(name)
+        _save_stage(name, district, keys[name], result)
+
+    def fail(name, error):
+        failed.append((name, error))
+        # 실패한 단계에 의존하는 단계는 실행하지 않습니다.
+        for other in list(pending):
+            if name in required_stages([other]):
+                pending.remove(other)
+                failed.append((other, RuntimeError(f"선행 단계 {name} 실패")))
+
+    if workers == 1:
+        _init_worker()
+        while pending:
+            name = next(n for n in pending if ready(n))
+            pending.remove(name)
+            try:
+                finish(name, _execute(name, district, [results[d] for d in STAGES[name].deps], out_dir, formats))
+            except Exception as e:
+                fail(name, e)
+        return results, executed, failed
+
+    from shared_dataset import publish
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(publish(),)) as pool:
+        running = {}
+        while pending or running:
+            for name in [n for n in pending if ready(n)]:
+                pending.remove(name)
+                deps = [results[d] for d in STAGES[name].deps]
+                running[pool.submit(_execute, name, district, deps, out_dir, formats)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(name, future.result())
+                except Exception as e:
+                    fail(name, e)
+    return results, executed, failed
+
+
+def write_outputs(results, targets, district, out_dir=OUTPUT_DIR):
+    """표 결과 단계는 CSV 로 저장한다. 저장한 경로 목록을 돌려준다."""
+    paths = []
+    for name in targets:
+        result = results.get(name)
+        if isinstance(result, pd.DataFrame):
+            path = os.path.join(out_dir, f"{district}_{name}.csv")
+            result.to_csv(path, index=False, encoding='utf-8-sig')
+            paths.append(path)
+        elif name.startswith('chart:') and result:
+            paths.extend(result)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="폐기물 분석 통합 실행기")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='분석을 실행합니다.')
+    run.add_argument('--district', default=DEFAULT_DISTRICT)
+    run.add_argument('--analyses', default=','.join(ANALYSES),
+                     help=f"쉼표로 구분한 분석 목록 (사용 가능: {', '.join(ANALYSES)})")
+    run.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg'])
+    run.add_argument('--out', default=OUTPUT_DIR)
+    run.add_argument('--workers', type=int, default=None)
+    run.add_argument('--force', action='store_true', help='캐시를 무시하고 모든 단계를 다시 실행합니다.')
+    run.add_argument('--profile', action='store_true', help='단계별 시간 / 메모리를 trace 파일로 기록합니다.')
+
+    sub.add_parser('list', help='분석과 단계 목록을 출력합니다.')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for analysis, targets in ANALYSES.items():
+            print(f"{analysis}: {', '.join(targets)}")
+        return 0
+
+    analyses = [a.strip() for a in args.analyses.split(',') if a.strip()]
+    unknown = [a for a in analyses if a not in ANALYSES]
+    if unknown:
+        parser.error(f"알 수 없는 분석입니다: {', '.join(unknown)} (사용 가능: {', '.join(ANALYSES)})")
+    targets = list(dict.fromkeys(t for a in analyses for t in ANALYSES[a]))
+    if args.profile:
+        profiling.enable()
+
+    results, executed, failed = run_pipeline(targets, args.district, args.out, tuple(args.formats),
+                                             args.workers, args.force)
+    saved = write_outputs(results, targets, args.district, args.out)
+
+    print(f"실행한 단계: {len(executed)}개, 캐시 사용: {len(results) - len(executed)}개, 저장된 파일: {len(saved)}개 ({args.out})")
+    for name, e in failed:
+        print(f"❌ {args.district} / {name}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())